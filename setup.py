@@ -14,6 +14,9 @@ setup(
         "pyyaml>=6.0",
         "watchdog>=3.0.0",
     ],
+    extras_require={
+        "fast": ["orjson>=3.9.0"],
+    },
     entry_points={
         "console_scripts": [
             "panos-upgrade=panos_upgrade.cli:main",
@@ -1,41 +1,71 @@
 """CLI interface for PAN-OS upgrade manager."""
 
 import click
+import csv
+import os
+import re
 import sys
+import time
 from pathlib import Path
 
 from panos_upgrade import __version__
-from panos_upgrade.config import get_config
-from panos_upgrade.logging_config import setup_logging, get_logger
-from panos_upgrade.work_dir_resolver import resolve_work_dir, ENV_VAR_NAME
+
+
+class _LazyContext(dict):
+    """
+    Click context object that initializes configuration and logging on first use.
+    
+    The 'config', 'logger' and 'work_dir_resolution' keys are populated together
+    the first time any of them is accessed, so commands that never touch them
+    (and --help on any subcommand) skip config loading and directory creation.
+    """
+    
+    _LAZY_KEYS = ('config', 'logger', 'work_dir_resolution')
+    
+    def __init__(self, work_dir=None):
+        super().__init__()
+        self._work_dir = work_dir
+    
+    def __missing__(self, key):
+        if key not in self._LAZY_KEYS:
+            raise KeyError(key)
+        self._initialize()
+        return self[key]
+    
+    def _initialize(self):
+        """Resolve work directory, load configuration and set up logging."""
+        from panos_upgrade.config import get_config
+        from panos_upgrade.logging_config import setup_logging
+        from panos_upgrade.work_dir_resolver import resolve_work_dir
+        
+        # Resolve work directory with source tracking
+        resolution = resolve_work_dir(cli_work_dir=self._work_dir)
+        
+        # Initialize configuration with resolved work directory
+        config = get_config(work_dir=resolution.path)
+        self['config'] = config
+        self['work_dir_resolution'] = resolution
+        
+        # Initialize logging
+        log_dir = config.get_path("logs")
+        log_level = config.get("logging.level", "INFO")
+        logger = setup_logging(log_dir, log_level, console_output=True)
+        self['logger'] = logger
+        
+        # Log the work directory source at INFO level (always visible)
+        logger.info(resolution.log_message())
+        logger.info(f"Configuration loaded: {config.config_file}")
 
 
 @click.group()
 @click.version_option(version=__version__)
 @click.option('--work-dir', type=click.Path(), 
-              help=f'Working directory. Priority: CLI flag > {ENV_VAR_NAME} env var > ~/.panos-upgrade.config.json > /opt/panos-upgrade')
+              help='Working directory. Priority: CLI flag > PANOS_UPGRADE_HOME env var > ~/.panos-upgrade.config.json > /opt/panos-upgrade')
 @click.pass_context
 def main(ctx, work_dir):
     """PAN-OS Upgrade Manager - Advanced device upgrade orchestration."""
-    ctx.ensure_object(dict)
-    
-    # Resolve work directory with source tracking
-    resolution = resolve_work_dir(cli_work_dir=work_dir)
-    
-    # Initialize configuration with resolved work directory
-    config = get_config(work_dir=resolution.path)
-    ctx.obj['config'] = config
-    ctx.obj['work_dir_resolution'] = resolution
-    
-    # Initialize logging
-    log_dir = config.get_path("logs")
-    log_level = config.get("logging.level", "INFO")
-    logger = setup_logging(log_dir, log_level, console_output=True)
-    ctx.obj['logger'] = logger
-    
-    # Log the work directory source at INFO level (always visible)
-    logger.info(resolution.log_message())
-    logger.info(f"Configuration loaded: {config.config_file}")
+    # Configuration and logging are loaded on first access by a command
+    ctx.obj = _LazyContext(work_dir=work_dir)
 
 
 # ============================================================================
@@ -61,9 +91,10 @@ def start(ctx, workers, rate_limit):
     
     # Update configuration if provided
     if workers is not None:
-        config.set('workers.max', workers)
+        config.set('workers.max', workers, save=False)
     if rate_limit is not None:
-        config.set('panorama.rate_limit', rate_limit)
+        config.set('panorama.rate_limit', rate_limit, save=False)
+    config.flush()
     
     logger.info(f"Starting daemon with {config.max_workers} workers")
     click.echo(f"Starting PAN-OS upgrade daemon with {config.max_workers} workers...")
@@ -85,7 +116,6 @@ def start(ctx, workers, rate_limit):
 def stop(ctx):
     """Stop the upgrade daemon."""
     import signal
-    from pathlib import Path
     
     config = ctx.obj['config']
     logger = ctx.obj['logger']
@@ -171,10 +201,8 @@ def submit(ctx, device, ha_pair, dry_run, download_only):
         # HA pair upgrade (specify both serials)
         panos-upgrade job submit --ha-pair 001234567890 001234567891
     """
-    import uuid
-    from datetime import datetime, timezone
-    from pathlib import Path
-    from panos_upgrade.utils.file_ops import atomic_write_json, read_json
+    from panos_upgrade.utils.file_ops import atomic_write_json
+    from panos_upgrade.exceptions import ActiveJobError, PendingJobError, ConflictingJobTypeError
     from panos_upgrade import constants
     
     config = ctx.obj['config']
@@ -197,42 +225,35 @@ def submit(ctx, device, ha_pair, dry_run, download_only):
         try:
             requested_type = constants.JOB_TYPE_DOWNLOAD_ONLY if download_only else constants.JOB_TYPE_STANDALONE
             _check_for_existing_job(config, device, requested_type)
-        except Exception as e:
-            from panos_upgrade.exceptions import ActiveJobError, PendingJobError, ConflictingJobTypeError
-            
-            if isinstance(e, ConflictingJobTypeError):
-                click.echo(f"Error: {e}", err=True)
-                click.echo(f"\nCannot mix download-only and normal upgrades", err=True)
-                click.echo(f"Cancel existing job first: panos-upgrade job cancel {e.existing_job_id}", err=True)
-                logger.warning(f"Rejected conflicting job type for device {device}")
-                sys.exit(1)
-            elif isinstance(e, (ActiveJobError, PendingJobError)):
-                click.echo(f"Error: {e}", err=True)
-                click.echo(f"\nUse 'panos-upgrade job cancel {e.job_id}' to cancel it first", err=True)
-                logger.warning(f"Rejected duplicate job submission for device {device}")
-                sys.exit(1)
-            else:
-                raise
+        except ConflictingJobTypeError as e:
+            click.echo(f"Error: {e}", err=True)
+            click.echo(f"\nCannot mix download-only and normal upgrades", err=True)
+            click.echo(f"Cancel existing job first: panos-upgrade job cancel {e.existing_job_id}", err=True)
+            logger.warning(f"Rejected conflicting job type for device {device}")
+            sys.exit(1)
+        except (ActiveJobError, PendingJobError) as e:
+            click.echo(f"Error: {e}", err=True)
+            click.echo(f"\nUse 'panos-upgrade job cancel {e.job_id}' to cancel it first", err=True)
+            logger.warning(f"Rejected duplicate job submission for device {device}")
+            sys.exit(1)
     
     # Check for existing jobs on HA pair devices
     if ha_pair:
-        primary_serial, secondary_serial = ha_pair
-        for serial in [primary_serial, secondary_serial]:
-            try:
-                _check_for_existing_job(config, serial, constants.JOB_TYPE_HA_PAIR)
-            except Exception as e:
-                from panos_upgrade.exceptions import ActiveJobError, PendingJobError, ConflictingJobTypeError
-                
-                if isinstance(e, (ActiveJobError, PendingJobError, ConflictingJobTypeError)):
-                    click.echo(f"Error: {e}", err=True)
-                    click.echo(f"\nUse 'panos-upgrade job cancel {e.job_id}' to cancel it first", err=True)
-                    logger.warning(f"Rejected duplicate job submission for HA pair device {serial}")
-                    sys.exit(1)
-                else:
-                    raise
+        try:
+            _check_for_existing_jobs(config, list(ha_pair), constants.JOB_TYPE_HA_PAIR)
+        except ConflictingJobTypeError as e:
+            click.echo(f"Error: {e}", err=True)
+            click.echo(f"\nUse 'panos-upgrade job cancel {e.existing_job_id}' to cancel it first", err=True)
+            logger.warning(f"Rejected conflicting job type for HA pair device {e.device_serial}")
+            sys.exit(1)
+        except (ActiveJobError, PendingJobError) as e:
+            click.echo(f"Error: {e}", err=True)
+            click.echo(f"\nUse 'panos-upgrade job cancel {e.job_id}' to cancel it first", err=True)
+            logger.warning(f"Rejected duplicate job submission for HA pair device {e.device_serial}")
+            sys.exit(1)
     
     # Generate job ID
-    job_id = f"cli-{uuid.uuid4()}"
+    job_id = _new_job_id("cli")
     
     # Create job data
     if device:
@@ -245,15 +266,7 @@ def submit(ctx, device, ha_pair, dry_run, download_only):
             logger.info(f"Submitting job for device {device}", extra={'serial': device})
             click.echo(f"Submitting upgrade job for device: {device}")
         
-        job_data = {
-            "job_id": job_id,
-            "type": job_type,
-            "devices": [device],
-            "ha_pair_name": "",
-            "dry_run": dry_run,
-            "download_only": download_only,
-            "created_at": datetime.now(timezone.utc).isoformat() + "Z"
-        }
+        job_data = _build_job_data(job_id, job_type, [device], dry_run, download_only)
         
         monitor_device = device
     else:
@@ -264,15 +277,9 @@ def submit(ctx, device, ha_pair, dry_run, download_only):
         click.echo(f"  Primary: {primary_serial}")
         click.echo(f"  Secondary: {secondary_serial}")
         
-        job_data = {
-            "job_id": job_id,
-            "type": constants.JOB_TYPE_HA_PAIR,
-            "devices": [primary_serial, secondary_serial],
-            "ha_pair_name": "",
-            "dry_run": dry_run,
-            "download_only": False,
-            "created_at": datetime.now(timezone.utc).isoformat() + "Z"
-        }
+        job_data = _build_job_data(
+            job_id, constants.JOB_TYPE_HA_PAIR, [primary_serial, secondary_serial], dry_run
+        )
         
         monitor_device = primary_serial
     
@@ -297,7 +304,86 @@ def submit(ctx, device, ha_pair, dry_run, download_only):
         sys.exit(1)
 
 
-def _check_for_existing_job(config, device_serial, requested_type=None):
+# Timestamp and random part of the last generated job ID (see _new_job_id)
+_last_job_id = (0, 0)
+
+
+def _new_job_id(prefix: str) -> str:
+    """
+    Generate a unique job ID that sorts in creation order.
+    
+    The ID is the prefix, a 12-digit hex millisecond timestamp and 80 random
+    bits. The daemon picks up queue/pending files in sorted filename order,
+    so time-ordered IDs make that order follow submission order. IDs made
+    within the same millisecond (bulk CSV submissions) increment the random
+    part of the previous ID instead of drawing new bits, so they keep CSV
+    order too.
+    
+    Args:
+        prefix: Job ID prefix identifying the submitter (e.g. "cli")
+        
+    Returns:
+        Job ID string
+    """
+    global _last_job_id
+    
+    timestamp_ms = time.time_ns() // 1_000_000
+    last_ms, last_random = _last_job_id
+    
+    if timestamp_ms <= last_ms and last_random < (1 << 80) - 1:
+        timestamp_ms, random_part = last_ms, last_random + 1
+    else:
+        random_part = int.from_bytes(os.urandom(10), "big")
+    
+    _last_job_id = (timestamp_ms, random_part)
+    return f"{prefix}-{timestamp_ms:012x}-{random_part:020x}"
+
+
+def _build_job_data(job_id, job_type, devices, dry_run, download_only=False, created_at=None):
+    """
+    Build the job file payload written to the pending queue.
+    
+    Args:
+        job_id: Job ID
+        job_type: Job type constant
+        devices: Device serial numbers in the job
+        dry_run: Whether the job is a dry run
+        download_only: Whether the job only downloads images
+        created_at: Creation timestamp (defaults to now); bulk commands pass
+            one timestamp for the whole batch
+        
+    Returns:
+        Job data dictionary
+    """
+    return {
+        "job_id": job_id,
+        "type": job_type,
+        "devices": devices,
+        "ha_pair_name": "",
+        "dry_run": dry_run,
+        "download_only": download_only,
+        "created_at": created_at or _utc_timestamp()
+    }
+
+
+def _utc_timestamp() -> str:
+    """
+    Format the current UTC time like the rest of the job files.
+    
+    Produces the same text as datetime.now(timezone.utc).isoformat() + "Z"
+    (always with microseconds) without building a datetime object.
+    
+    Returns:
+        Timestamp string, e.g. "2025-01-01T12:00:00.000000+00:00Z"
+    """
+    seconds, nanoseconds = divmod(time.time_ns(), 1_000_000_000)
+    return (
+        time.strftime("%Y-%m-%dT%H:%M:%S", time.gmtime(seconds))
+        + f".{nanoseconds // 1000:06d}+00:00Z"
+    )
+
+
+def _check_for_existing_job(config, device_serial, requested_type=None, job_index=None):
     """
     Check if device already has a pending or active job.
     
@@ -305,80 +391,125 @@ def _check_for_existing_job(config, device_serial, requested_type=None):
         config: Configuration instance
         device_serial: Device serial number
         requested_type: Type of job being requested (for conflict detection)
+        job_index: Index from _build_job_index() (built on demand if omitted)
         
     Raises:
         PendingJobError: If device has a pending job
         ActiveJobError: If device has an active job
         ConflictingJobTypeError: If job type conflicts
     """
-    from panos_upgrade.utils.file_ops import safe_read_json
+    _check_for_existing_jobs(config, [device_serial], requested_type, job_index)
+
+
+def _check_for_existing_jobs(config, device_serials, requested_type=None, job_index=None):
+    """
+    Check if any of several devices already has a pending or active job.
+    
+    Args:
+        config: Configuration instance
+        device_serials: Device serial numbers, in reporting order
+        requested_type: Type of job being requested (for conflict detection)
+        job_index: Index from _build_job_index() (built on demand if omitted)
+        
+    Raises:
+        PendingJobError: If a device has a pending job
+        ActiveJobError: If a device has an active job
+        ConflictingJobTypeError: If job type conflicts
+    """
     from panos_upgrade.exceptions import ActiveJobError, PendingJobError, ConflictingJobTypeError
+    
+    if job_index is None:
+        job_index = _build_job_index(config, device_serials)
+    
+    for device_serial in device_serials:
+        entry = job_index.get(device_serial)
+        if entry is None:
+            continue
+        
+        status, job_data = entry
+        existing_type = job_data.get("type", "unknown")
+        
+        # Check for job type conflict
+        if requested_type and existing_type != requested_type:
+            raise ConflictingJobTypeError(
+                device_serial=device_serial,
+                existing_type=existing_type,
+                requested_type=requested_type,
+                existing_job_id=job_data.get("job_id", "unknown")
+            )
+        
+        error_class = PendingJobError if status == "pending" else ActiveJobError
+        raise error_class(
+            device_serial=device_serial,
+            job_id=job_data.get("job_id", "unknown"),
+            created_at=job_data.get("created_at", "")
+        )
+
+
+def _build_job_index(config, device_serials=None):
+    """
+    Map every device serial in the pending and active queues to its job.
+    
+    Each job file is read once. Bulk commands build the index before their
+    device loop and pass it to _check_for_existing_job(), turning a full
+    queue scan per device into a dict lookup.
+    
+    Args:
+        config: Configuration instance
+        device_serials: If given, only files whose raw bytes mention one of
+            these serials are parsed; the index may then omit other devices
+        
+    Returns:
+        Dictionary of serial -> (status, job_data), status being "pending"
+        or "active"; pending jobs take precedence
+    """
+    from panos_upgrade.utils.file_ops import iter_json_files, read_json_files
     from panos_upgrade import constants
     
-    # Check pending queue first
-    pending_dir = config.get_path(constants.DIR_QUEUE_PENDING)
-    if pending_dir.exists():
-        for job_file in pending_dir.glob("*.json"):
-            try:
-                job_data = safe_read_json(job_file)
-                if job_data and device_serial in job_data.get("devices", []):
-                    existing_type = job_data.get("type", "unknown")
-                    
-                    # Check for job type conflict
-                    if requested_type and existing_type != requested_type:
-                        raise ConflictingJobTypeError(
-                            device_serial=device_serial,
-                            existing_type=existing_type,
-                            requested_type=requested_type,
-                            existing_job_id=job_data.get("job_id", "unknown")
-                        )
-                    
-                    raise PendingJobError(
-                        device_serial=device_serial,
-                        job_id=job_data.get("job_id", "unknown"),
-                        created_at=job_data.get("created_at", "")
-                    )
-            except (PendingJobError, ActiveJobError, ConflictingJobTypeError):
-                raise
-            except Exception:
-                # Skip malformed files
-                continue
+    # Serials appear verbatim in the file unless JSON would escape them
+    must_contain = ()
+    if device_serials and all(
+        serial.isascii() and serial.isprintable() and '"' not in serial and '\\' not in serial
+        for serial in device_serials
+    ):
+        must_contain = [serial.encode() for serial in device_serials]
     
-    # Check active queue
-    active_dir = config.get_path(constants.DIR_QUEUE_ACTIVE)
-    if active_dir.exists():
-        for job_file in active_dir.glob("*.json"):
-            try:
-                job_data = safe_read_json(job_file)
-                if job_data and device_serial in job_data.get("devices", []):
-                    existing_type = job_data.get("type", "unknown")
-                    
-                    # Check for job type conflict
-                    if requested_type and existing_type != requested_type:
-                        raise ConflictingJobTypeError(
-                            device_serial=device_serial,
-                            existing_type=existing_type,
-                            requested_type=requested_type,
-                            existing_job_id=job_data.get("job_id", "unknown")
-                        )
-                    
-                    raise ActiveJobError(
-                        device_serial=device_serial,
-                        job_id=job_data.get("job_id", "unknown"),
-                        created_at=job_data.get("created_at", "")
-                    )
-            except (PendingJobError, ActiveJobError, ConflictingJobTypeError):
-                raise
-            except Exception:
-                # Skip malformed files
-                continue
+    # Read pending and active jobs through one pool so both directories'
+    # reads overlap; pending files come first, so they win on duplicates
+    pending_files = list(iter_json_files(config.get_path(constants.DIR_QUEUE_PENDING)))
+    active_files = list(iter_json_files(config.get_path(constants.DIR_QUEUE_ACTIVE)))
+    
+    job_index = {}
+    job_files = pending_files + active_files
+    for index, job_data in enumerate(read_json_files(job_files, must_contain=must_contain)):
+        status = "pending" if index < len(pending_files) else "active"
+        _add_to_job_index(job_index, status, job_data)
+    
+    return job_index
 
 
-@job.command()
+def _add_to_job_index(job_index, status, job_data):
+    """
+    Add a job's devices to a job index, keeping existing entries.
+    
+    Args:
+        job_index: Index from _build_job_index()
+        status: Queue status of the job ("pending" or "active")
+        job_data: Job file contents
+    """
+    try:
+        for serial in job_data.get("devices", ()):
+            job_index.setdefault(serial, (status, job_data))
+    except Exception:
+        # Skip malformed files
+        pass
+
+
+@job.command(name='list')
 @click.option('--status', type=click.Choice(['pending', 'active', 'completed', 'failed', 'cancelled']),
               help='Filter by status')
 @click.pass_context
-def list(ctx, status):
+def list_jobs(ctx, status):
     """List upgrade jobs."""
     logger = ctx.obj['logger']
     
@@ -474,6 +605,10 @@ def metrics(ctx, serial):
     click.echo("Device metrics functionality will be implemented")
 
 
+# Minimum seconds between discovery progress redraws
+_PROGRESS_INTERVAL = 0.1
+
+
 @device.command()
 @click.option('--workers', '-w', type=int, default=None,
               help='Number of parallel workers (default: workers.max from config)')
@@ -517,8 +652,16 @@ def discover(ctx, workers):
             firewall_password=config.firewall_password
         )
         
-        # Progress callback to show status
+        # Progress callback to show status, redrawn at most every
+        # _PROGRESS_INTERVAL seconds and only on a terminal
+        last_progress = 0.0
+        
         def progress_callback(current: int, total: int, message: str):
+            nonlocal last_progress
+            now = time.monotonic()
+            if current != total and now - last_progress < _PROGRESS_INTERVAL:
+                return
+            last_progress = now
             click.echo(f"\r  {message}", nl=False)
             if current == total:
                 click.echo()  # Newline after last device
@@ -527,25 +670,28 @@ def discover(ctx, workers):
         stats = inventory.discover_devices(
             max_workers=max_workers,
             retry_attempts=retry_attempts,
-            progress_callback=progress_callback
+            progress_callback=progress_callback if sys.stdout.isatty() else None
         )
-        
-        click.echo(f"\n✓ Discovery complete:")
-        click.echo(f"  Total devices: {stats['total']}")
-        click.echo(f"  New devices: {stats['new']}")
-        click.echo(f"  Updated devices: {stats['updated']}")
-        click.echo(f"  Standalone: {stats['standalone']}")
-        click.echo(f"  HA pair members: {stats['ha_pair']}")
-        if stats['unknown'] > 0:
-            click.echo(f"  Unknown (HA query failed): {stats['unknown']}")
-        click.echo(f"\nInventory saved to: {inventory_file}")
-        
-        logger.info(f"Device discovery complete: {stats['total']} devices")
-        
     except Exception as e:
         click.echo(f"\nError discovering devices: {e}", err=True)
         logger.error(f"Device discovery failed: {e}", exc_info=True)
         sys.exit(1)
+    
+    click.echo(f"\n✓ Discovery complete:")
+    click.echo(f"  Total devices: {stats['total']}")
+    click.echo(f"  New devices: {stats['new']}")
+    click.echo(f"  Updated devices: {stats['updated']}")
+    click.echo(f"  Standalone: {stats['standalone']}")
+    click.echo(f"  HA pair members: {stats['ha_pair']}")
+    if stats['unknown'] > 0:
+        click.echo(f"  Unknown (HA query failed): {stats['unknown']}")
+    click.echo(f"\nInventory saved to: {inventory_file}")
+    
+    logger.info(f"Device discovery complete: {stats['total']} devices")
+
+
+# Write buffer for exported CSV files, so large inventories go out in few writes
+_CSV_WRITE_BUFFER = 1 << 20
 
 
 @device.command(name='export')
@@ -569,23 +715,18 @@ def export_devices(ctx, output_dir, standalone_file, ha_pairs_file):
         panos-upgrade device export --output-dir /tmp
         panos-upgrade device export --standalone-file standalone.csv --ha-pairs-file pairs.csv
     """
-    import csv
-    from pathlib import Path
     from panos_upgrade.device_inventory import (
         DeviceInventory, DEVICE_TYPE_STANDALONE, DEVICE_TYPE_HA_PAIR, 
         DEVICE_TYPE_UNKNOWN, HA_STATE_ACTIVE
     )
-    from panos_upgrade.panorama_client import PanoramaClient
     
     config = ctx.obj['config']
     logger = ctx.obj['logger']
     
     # Load inventory
     inventory_file = config.get_path("devices/inventory.json")
-    panorama = PanoramaClient(config)
     inventory = DeviceInventory(
-        inventory_file, 
-        panorama,
+        inventory_file,
         firewall_username=config.firewall_username,
         firewall_password=config.firewall_password
     )
@@ -597,48 +738,6 @@ def export_devices(ctx, output_dir, standalone_file, ha_pairs_file):
     
     click.echo(f"Exporting {len(devices)} devices from inventory...")
     
-    # Separate devices by type
-    standalone_devices = []
-    ha_devices = {}  # serial -> device info
-    unknown_devices = []
-    
-    for device in devices:
-        device_type = device.get('device_type', DEVICE_TYPE_UNKNOWN)
-        
-        if device_type == DEVICE_TYPE_STANDALONE:
-            standalone_devices.append(device)
-        elif device_type == DEVICE_TYPE_HA_PAIR:
-            ha_devices[device['serial']] = device
-        else:
-            # Unknown devices go to standalone CSV with warning
-            unknown_devices.append(device)
-    
-    # Group HA devices into pairs
-    ha_pairs = []
-    processed_serials = set()
-    orphaned_ha_devices = []
-    
-    for serial, device in ha_devices.items():
-        if serial in processed_serials:
-            continue
-        
-        peer_serial = device.get('peer_serial', '')
-        if peer_serial and peer_serial in ha_devices:
-            peer_device = ha_devices[peer_serial]
-            
-            # Determine order: active device first
-            if device.get('ha_state') == HA_STATE_ACTIVE:
-                ha_pairs.append((device, peer_device))
-            else:
-                ha_pairs.append((peer_device, device))
-            
-            processed_serials.add(serial)
-            processed_serials.add(peer_serial)
-        else:
-            # Peer not in inventory - orphaned HA device
-            orphaned_ha_devices.append(device)
-            processed_serials.add(serial)
-    
     # Create output directory if needed
     output_path = Path(output_dir)
     output_path.mkdir(parents=True, exist_ok=True)
@@ -646,33 +745,73 @@ def export_devices(ctx, output_dir, standalone_file, ha_pairs_file):
     standalone_path = output_path / standalone_file
     ha_pairs_path = output_path / ha_pairs_file
     
-    # Write standalone CSV (includes unknown and orphaned devices)
-    all_standalone = standalone_devices + unknown_devices + orphaned_ha_devices
-    
-    with open(standalone_path, 'w', newline='') as f:
-        writer = csv.writer(f)
-        writer.writerow(['serial', 'hostname', 'mgmt_ip', 'current_version', 'model'])
-        for device in all_standalone:
-            writer.writerow([
-                device.get('serial', ''),
-                device.get('hostname', ''),
-                device.get('mgmt_ip', ''),
-                device.get('current_version', ''),
-                device.get('model', '')
-            ])
-    
-    # Write HA pairs CSV
-    with open(ha_pairs_path, 'w', newline='') as f:
-        writer = csv.writer(f)
-        writer.writerow([
+    def standalone_row(device):
+        return (
+            device.get('serial', ''),
+            device.get('hostname', ''),
+            device.get('mgmt_ip', ''),
+            device.get('current_version', ''),
+            device.get('model', '')
+        )
+    
+    standalone_count = 0
+    unknown_count = 0
+    ha_pair_count = 0
+    unpaired = {}  # serial -> HA device whose peer has not been seen yet
+    awaiting_peer = {}  # peer serial -> unpaired HA device naming it
+    
+    # Classify devices and write both CSVs in a single pass over the inventory.
+    # The standalone CSV also receives unknown and orphaned HA devices.
+    with open(standalone_path, 'w', newline='', buffering=_CSV_WRITE_BUFFER) as standalone_f, \
+            open(ha_pairs_path, 'w', newline='', buffering=_CSV_WRITE_BUFFER) as ha_pairs_f:
+        standalone_writer = csv.writer(standalone_f)
+        standalone_writer.writerow(['serial', 'hostname', 'mgmt_ip', 'current_version', 'model'])
+        ha_pairs_writer = csv.writer(ha_pairs_f)
+        ha_pairs_writer.writerow([
             'serial_1', 'serial_2', 
             'hostname_1', 'hostname_2', 
             'mgmt_ip_1', 'mgmt_ip_2', 
             'current_version_1', 'current_version_2', 
             'model'
         ])
-        for device_1, device_2 in ha_pairs:
-            writer.writerow([
+        
+        for device in devices:
+            device_type = device.get('device_type', DEVICE_TYPE_UNKNOWN)
+            
+            if device_type == DEVICE_TYPE_STANDALONE:
+                standalone_count += 1
+                standalone_writer.writerow(standalone_row(device))
+                continue
+            if device_type != DEVICE_TYPE_HA_PAIR:
+                # Unknown devices go to standalone CSV with warning
+                unknown_count += 1
+                standalone_writer.writerow(standalone_row(device))
+                continue
+            
+            serial = device['serial']
+            peer_serial = device.get('peer_serial', '')
+            
+            if peer_serial and peer_serial in unpaired:
+                first = unpaired.pop(peer_serial)
+            elif serial in awaiting_peer:
+                first = awaiting_peer[serial]
+                del unpaired[first['serial']]
+            else:
+                unpaired[serial] = device
+                if peer_serial:
+                    awaiting_peer.setdefault(peer_serial, device)
+                continue
+            
+            awaiting_peer.pop(first.get('peer_serial', ''), None)
+            
+            # Determine order: active device first
+            if first.get('ha_state') == HA_STATE_ACTIVE:
+                device_1, device_2 = first, device
+            else:
+                device_1, device_2 = device, first
+            
+            ha_pair_count += 1
+            ha_pairs_writer.writerow((
                 device_1.get('serial', ''),
                 device_2.get('serial', ''),
                 device_1.get('hostname', ''),
@@ -682,15 +821,19 @@ def export_devices(ctx, output_dir, standalone_file, ha_pairs_file):
                 device_1.get('current_version', ''),
                 device_2.get('current_version', ''),
                 device_1.get('model', '')  # Assume same model for HA pair
-            ])
+            ))
+        
+        # Peer not in inventory - orphaned HA devices
+        orphaned_ha_devices = list(unpaired.values())
+        standalone_writer.writerows(standalone_row(device) for device in orphaned_ha_devices)
     
     # Display summary
     click.echo(f"\n✓ Export complete:")
-    click.echo(f"  Standalone devices: {len(standalone_devices)} → {standalone_path}")
-    click.echo(f"  HA pairs: {len(ha_pairs)} ({len(ha_pairs) * 2} devices) → {ha_pairs_path}")
+    click.echo(f"  Standalone devices: {standalone_count} → {standalone_path}")
+    click.echo(f"  HA pairs: {ha_pair_count} ({ha_pair_count * 2} devices) → {ha_pairs_path}")
     
-    if unknown_devices:
-        click.echo(f"  Unknown devices: {len(unknown_devices)} (included in standalone)")
+    if unknown_count:
+        click.echo(f"  Unknown devices: {unknown_count} (included in standalone)")
     
     if orphaned_ha_devices:
         click.echo(f"  Orphaned HA devices: {len(orphaned_ha_devices)} (peer not in inventory, included in standalone)")
@@ -698,8 +841,8 @@ def export_devices(ctx, output_dir, standalone_file, ha_pairs_file):
             click.echo(f"    - {device.get('serial')} (peer: {device.get('peer_serial')})")
     
     logger.info(
-        f"Device export complete: {len(all_standalone)} standalone, "
-        f"{len(ha_pairs)} HA pairs"
+        f"Device export complete: {standalone_count + unknown_count + len(orphaned_ha_devices)} "
+        f"standalone, {ha_pair_count} HA pairs"
     )
 
 
@@ -713,6 +856,18 @@ def config():
     pass
 
 
+# Type conversion for known numeric config keys
+_CONFIG_COERCERS = {
+    'workers.max': int,
+    'panorama.rate_limit': int,
+    'panorama.timeout': int,
+    'validation.tcp_session_margin': float,
+    'validation.route_margin': float,
+    'validation.arp_margin': float,
+    'validation.min_disk_gb': float,
+}
+
+
 @config.command(name='set')
 @click.argument('key')
 @click.argument('value')
@@ -722,12 +877,9 @@ def set_config(ctx, key, value):
     config = ctx.obj['config']
     logger = ctx.obj['logger']
     
-    # Type conversion for known numeric values
-    if key in ['workers.max', 'panorama.rate_limit', 'panorama.timeout']:
-        value = int(value)
-    elif key in ['validation.tcp_session_margin', 'validation.route_margin', 
-                 'validation.arp_margin', 'validation.min_disk_gb']:
-        value = float(value)
+    coerce = _CONFIG_COERCERS.get(key)
+    if coerce:
+        value = coerce(value)
     
     config.set(key, value)
     logger.info(f"Configuration updated: {key} = {value}")
@@ -803,6 +955,10 @@ def validate_path(ctx):
 # CSV-Based Bulk Commands
 # ============================================================================
 
+# Read buffer for input CSV files, so large lists come in with few reads
+_CSV_READ_BUFFER = 1 << 20
+
+
 def _read_csv_serials(csv_file: str) -> list:
     """
     Read serial numbers from a CSV file.
@@ -816,22 +972,21 @@ def _read_csv_serials(csv_file: str) -> list:
     Raises:
         click.ClickException: If CSV is invalid or missing 'serial' column
     """
-    import csv
-    
-    serials = []
     try:
-        with open(csv_file, 'r', newline='') as f:
-            reader = csv.DictReader(f)
+        with open(csv_file, 'r', newline='', buffering=_CSV_READ_BUFFER) as f:
+            reader = csv.reader(f)
+            header = next(reader, [])
             
-            if 'serial' not in reader.fieldnames:
+            if 'serial' not in header:
                 raise click.ClickException(
-                    f"CSV file must have a 'serial' column. Found columns: {', '.join(reader.fieldnames or [])}"
+                    f"CSV file must have a 'serial' column. Found columns: {', '.join(header)}"
                 )
             
-            for row in reader:
-                serial = row.get('serial', '').strip()
-                if serial:
-                    serials.append(serial)
+            idx = header.index('serial')
+            serials = [
+                serial for serial in (row[idx].strip() for row in reader if len(row) > idx)
+                if serial
+            ]
     except FileNotFoundError:
         raise click.ClickException(f"CSV file not found: {csv_file}")
     except csv.Error as e:
@@ -853,25 +1008,29 @@ def _read_csv_ha_pairs(csv_file: str) -> list:
     Raises:
         click.ClickException: If CSV is invalid or missing required columns
     """
-    import csv
-    
-    pairs = []
     try:
-        with open(csv_file, 'r', newline='') as f:
-            reader = csv.DictReader(f)
+        with open(csv_file, 'r', newline='', buffering=_CSV_READ_BUFFER) as f:
+            reader = csv.reader(f)
+            header = next(reader, None)
             
-            if not reader.fieldnames:
+            if not header:
                 raise click.ClickException("CSV file is empty or has no headers")
             
-            if 'serial_1' not in reader.fieldnames or 'serial_2' not in reader.fieldnames:
+            if 'serial_1' not in header or 'serial_2' not in header:
                 raise click.ClickException(
                     f"CSV file must have 'serial_1' and 'serial_2' columns. "
-                    f"Found columns: {', '.join(reader.fieldnames)}"
+                    f"Found columns: {', '.join(header)}"
                 )
             
+            idx_1 = header.index('serial_1')
+            idx_2 = header.index('serial_2')
+            min_len = max(idx_1, idx_2) + 1
+            pairs = []
             for row in reader:
-                serial_1 = row.get('serial_1', '').strip()
-                serial_2 = row.get('serial_2', '').strip()
+                if len(row) < min_len:
+                    continue
+                serial_1 = row[idx_1].strip()
+                serial_2 = row[idx_2].strip()
                 if serial_1 and serial_2:
                     pairs.append((serial_1, serial_2))
     except FileNotFoundError:
@@ -882,6 +1041,65 @@ def _read_csv_ha_pairs(csv_file: str) -> list:
     return pairs
 
 
+def _unique_ha_pairs(pairs: list) -> list:
+    """
+    Drop repeated HA pairs, keeping the first occurrence of each.
+    
+    A pair listed again with its serials swapped counts as a duplicate.
+    
+    Args:
+        pairs: List of tuples (serial_1, serial_2)
+        
+    Returns:
+        List of unique pairs in input order
+    """
+    unique = {}
+    for pair in pairs:
+        unique.setdefault(frozenset(pair), pair)
+    return list(unique.values())
+
+
+# Number of queued and skipped-for-existing-job entries listed by bulk commands
+_PREVIEW_QUEUED = 10
+_PREVIEW_SKIPPED = 5
+
+
+def _write_pending_jobs(
+    pending_jobs: list,
+    results: dict,
+    queued_key: str,
+    queued_preview: list,
+    logger,
+    queued_message: str
+):
+    """
+    Write a bulk submission's job files as one batch and record each outcome.
+    
+    Each file still appears atomically; a failed write is counted as an
+    error without stopping the rest of the batch.
+    
+    Args:
+        pending_jobs: List of (job_file, job_data, label, summary) tuples
+        results: Result counters; 'errors' and queued_key are incremented
+        queued_key: Name of the counter for successfully queued jobs
+        queued_preview: Preview list that queued summaries are appended to
+        logger: Logger for per-job messages
+        queued_message: Log format for a queued job, with one %s for the label
+    """
+    from panos_upgrade.utils.file_ops import write_json_files
+    
+    write_errors = write_json_files([(job_file, job_data) for job_file, job_data, _, _ in pending_jobs])
+    for (_, _, label, summary), error in zip(pending_jobs, write_errors):
+        if error:
+            results["errors"] += 1
+            logger.error("Failed to queue %s: %s", label, error)
+        else:
+            results[queued_key] += 1
+            if len(queued_preview) < _PREVIEW_QUEUED:
+                queued_preview.append(summary)
+            logger.info(queued_message, label)
+
+
 def _process_csv_jobs(ctx, csv_file: str, dry_run: bool, download_only: bool):
     """
     Process a CSV file and create jobs for each serial.
@@ -892,12 +1110,9 @@ def _process_csv_jobs(ctx, csv_file: str, dry_run: bool, download_only: bool):
         dry_run: Whether to simulate without creating jobs
         download_only: Whether to create download-only jobs
     """
-    import uuid
-    from datetime import datetime, timezone
     from panos_upgrade.device_inventory import DeviceInventory
-    from panos_upgrade.panorama_client import PanoramaClient
-    from panos_upgrade.utils.file_ops import atomic_write_json, safe_read_json
-    from panos_upgrade.exceptions import ActiveJobError, PendingJobError
+    from panos_upgrade.utils.file_ops import safe_read_json
+    from panos_upgrade.exceptions import ActiveJobError, PendingJobError, ConflictingJobTypeError
     from panos_upgrade import constants
     
     config = ctx.obj['config']
@@ -917,18 +1132,22 @@ def _process_csv_jobs(ctx, csv_file: str, dry_run: bool, download_only: bool):
     
     click.echo(f"Found {len(serials)} serial(s) in CSV")
     
+    unique_serials = list(dict.fromkeys(serials))
+    if len(unique_serials) < len(serials):
+        click.echo(f"  Note: {len(serials) - len(unique_serials)} duplicate serial(s) ignored")
+        serials = unique_serials
+    
     # Load inventory for mgmt_ip lookup
     inventory_file = config.get_path("devices/inventory.json")
-    panorama = PanoramaClient(config)
     inventory = DeviceInventory(
-        inventory_file, 
-        panorama,
+        inventory_file,
         firewall_username=config.firewall_username,
         firewall_password=config.firewall_password
     )
     
-    # Load upgrade paths
+    # Load upgrade paths, joined once for the queued-device lines
     upgrade_paths = safe_read_json(config.upgrade_paths_file, default={})
+    arrow_paths = {version: " → ".join(path) for version, path in upgrade_paths.items()}
     
     # Track results
     results = {
@@ -945,64 +1164,60 @@ def _process_csv_jobs(ctx, csv_file: str, dry_run: bool, download_only: bool):
     skipped_no_path = []
     skipped_existing_job = []
     
+    # Scan the queues once for the whole batch
+    job_index = _build_job_index(config)
+    pending_dir = config.get_path(constants.DIR_QUEUE_PENDING)
+    pending_jobs = []
+    created_at = _utc_timestamp()
+    
     for serial in serials:
         # Check if device is in inventory
         device_info = inventory.get_device(serial)
         if not device_info:
             results["skipped_not_in_inventory"] += 1
             skipped_not_in_inventory.append(serial)
-            logger.warning(f"Skipping {serial}: Not in inventory")
+            logger.warning("Skipping %s: Not in inventory", serial)
             continue
         
         hostname = device_info.get("hostname", serial)
         current_version = device_info.get("current_version", "unknown")
         
         # Check upgrade path
-        if current_version not in upgrade_paths:
+        if current_version not in arrow_paths:
             results["skipped_no_path"] += 1
             skipped_no_path.append(f"{serial} ({hostname}): version {current_version}")
-            logger.info(f"Skipping {serial}: No path for {current_version}")
+            logger.info("Skipping %s: No path for %s", serial, current_version)
             continue
         
         # Check for existing job
         try:
-            _check_for_existing_job(config, serial, job_type)
-        except (ActiveJobError, PendingJobError, Exception):
+            _check_for_existing_job(config, serial, job_type, job_index)
+        except (ActiveJobError, PendingJobError, ConflictingJobTypeError):
             results["skipped_existing_job"] += 1
-            skipped_existing_job.append(f"{serial} ({hostname})")
-            logger.info(f"Skipping {serial}: Already has job")
+            if len(skipped_existing_job) < _PREVIEW_SKIPPED:
+                skipped_existing_job.append(f"{serial} ({hostname})")
+            logger.info("Skipping %s: Already has job", serial)
             continue
         
+        path_str = arrow_paths[current_version]
+        summary = f"{serial} ({hostname}): {current_version} → {path_str}"
+        
         # Create job
         if not dry_run:
-            try:
-                job_id = f"csv-{job_type_str}-{uuid.uuid4()}"
-                job_data = {
-                    "job_id": job_id,
-                    "type": job_type,
-                    "devices": [serial],
-                    "ha_pair_name": "",
-                    "dry_run": False,
-                    "download_only": download_only,
-                    "created_at": datetime.now(timezone.utc).isoformat() + "Z"
-                }
-                
-                pending_dir = config.get_path(constants.DIR_QUEUE_PENDING)
-                job_file = pending_dir / f"{job_id}.json"
-                atomic_write_json(job_file, job_data)
-                
-                results["queued"] += 1
-                path_str = " → ".join(upgrade_paths[current_version])
-                queued_devices.append(f"{serial} ({hostname}): {current_version} → {path_str}")
-                logger.info(f"Queued {serial} for {job_type_str}")
-                
-            except Exception as e:
-                results["errors"] += 1
-                logger.error(f"Failed to queue {serial}: {e}")
+            job_id = _new_job_id(f"csv-{job_type_str}")
+            job_data = _build_job_data(
+                job_id, job_type, [serial], False, download_only, created_at
+            )
+            _add_to_job_index(job_index, "pending", job_data)
+            pending_jobs.append((pending_dir / f"{job_id}.json", job_data, serial, summary))
         else:
             results["queued"] += 1
-            path_str = " → ".join(upgrade_paths[current_version])
-            queued_devices.append(f"{serial} ({hostname}): {current_version} → {path_str}")
+            if len(queued_devices) < _PREVIEW_QUEUED:
+                queued_devices.append(summary)
+    
+    _write_pending_jobs(
+        pending_jobs, results, "queued", queued_devices, logger, f"Queued %s for {job_type_str}"
+    )
     
     # Display results
     if dry_run:
@@ -1011,28 +1226,24 @@ def _process_csv_jobs(ctx, csv_file: str, dry_run: bool, download_only: bool):
         click.echo(f"\nQueued for {job_type_str}:\n")
     
     if queued_devices:
-        for device in queued_devices[:10]:
-            click.echo(f"  {device}")
-        if len(queued_devices) > 10:
-            click.echo(f"  ... and {len(queued_devices) - 10} more")
+        click.echo("\n".join(f"  {device}" for device in queued_devices))
+        if results["queued"] > _PREVIEW_QUEUED:
+            click.echo(f"  ... and {results['queued'] - _PREVIEW_QUEUED} more")
     
     # Show skipped devices
     if skipped_not_in_inventory:
         click.echo("\nSkipped (not in inventory):")
-        for serial in skipped_not_in_inventory:
-            click.echo(f"  {serial}")
+        click.echo("\n".join(f"  {serial}" for serial in skipped_not_in_inventory))
     
     if skipped_no_path:
         click.echo("\nSkipped (no upgrade path):")
-        for device in skipped_no_path:
-            click.echo(f"  {device}")
+        click.echo("\n".join(f"  {device}" for device in skipped_no_path))
     
     if skipped_existing_job:
         click.echo("\nSkipped (existing job):")
-        for device in skipped_existing_job[:5]:
-            click.echo(f"  {device}")
-        if len(skipped_existing_job) > 5:
-            click.echo(f"  ... and {len(skipped_existing_job) - 5} more")
+        click.echo("\n".join(f"  {device}" for device in skipped_existing_job))
+        if results["skipped_existing_job"] > _PREVIEW_SKIPPED:
+            click.echo(f"  ... and {results['skipped_existing_job'] - _PREVIEW_SKIPPED} more")
     
     # Summary
     click.echo(f"\nSummary:")
@@ -1120,12 +1331,9 @@ def upgrade_ha_pairs(ctx, csv_file, dry_run):
         panos-upgrade upgrade-ha-pairs ha_pairs.csv
         panos-upgrade upgrade-ha-pairs ha_pairs.csv --dry-run
     """
-    import uuid
-    from datetime import datetime, timezone
     from panos_upgrade.device_inventory import DeviceInventory
-    from panos_upgrade.panorama_client import PanoramaClient
-    from panos_upgrade.utils.file_ops import atomic_write_json, safe_read_json
-    from panos_upgrade.exceptions import ActiveJobError, PendingJobError
+    from panos_upgrade.utils.file_ops import safe_read_json
+    from panos_upgrade.exceptions import ActiveJobError, PendingJobError, ConflictingJobTypeError
     from panos_upgrade import constants
     
     config = ctx.obj['config']
@@ -1142,18 +1350,22 @@ def upgrade_ha_pairs(ctx, csv_file, dry_run):
     
     click.echo(f"Found {len(pairs)} HA pair(s) in CSV")
     
+    unique_pairs = _unique_ha_pairs(pairs)
+    if len(unique_pairs) < len(pairs):
+        click.echo(f"  Note: {len(pairs) - len(unique_pairs)} duplicate HA pair(s) ignored")
+        pairs = unique_pairs
+    
     # Load inventory for mgmt_ip lookup
     inventory_file = config.get_path("devices/inventory.json")
-    panorama = PanoramaClient(config)
     inventory = DeviceInventory(
-        inventory_file, 
-        panorama,
+        inventory_file,
         firewall_username=config.firewall_username,
         firewall_password=config.firewall_password
     )
     
-    # Load upgrade paths
+    # Load upgrade paths, joined once for the queued-device lines
     upgrade_paths = safe_read_json(config.upgrade_paths_file, default={})
+    arrow_paths = {version: " → ".join(path) for version, path in upgrade_paths.items()}
     
     # Track results
     results = {
@@ -1170,6 +1382,12 @@ def upgrade_ha_pairs(ctx, csv_file, dry_run):
     skipped_no_path = []
     skipped_existing_job = []
     
+    # Scan the queues once for the whole batch
+    job_index = _build_job_index(config)
+    pending_dir = config.get_path(constants.DIR_QUEUE_PENDING)
+    pending_jobs = []
+    created_at = _utc_timestamp()
+    
     for serial_1, serial_2 in pairs:
         # Check if both devices are in inventory
         info_1 = inventory.get_device(serial_1)
@@ -1178,70 +1396,59 @@ def upgrade_ha_pairs(ctx, csv_file, dry_run):
         if not info_1:
             results["skipped_not_in_inventory"] += 1
             skipped_not_in_inventory.append(serial_1)
-            logger.warning(f"Skipping pair: {serial_1} not in inventory")
+            logger.warning("Skipping pair: %s not in inventory", serial_1)
             continue
         
         if not info_2:
             results["skipped_not_in_inventory"] += 1
             skipped_not_in_inventory.append(serial_2)
-            logger.warning(f"Skipping pair: {serial_2} not in inventory")
+            logger.warning("Skipping pair: %s not in inventory", serial_2)
             continue
         
         # Use first device's version for upgrade path check
         version_1 = info_1.get("current_version", "unknown")
         
         # Check upgrade path
-        if version_1 not in upgrade_paths:
+        if version_1 not in arrow_paths:
             results["skipped_no_path"] += 1
             skipped_no_path.append(f"{serial_1}/{serial_2}: version {version_1}")
-            logger.info(f"Skipping pair: No path for {version_1}")
+            logger.info("Skipping pair: No path for %s", version_1)
             continue
         
         # Check for existing jobs on either device
-        skip_pair = False
-        for serial in [serial_1, serial_2]:
-            try:
-                _check_for_existing_job(config, serial, constants.JOB_TYPE_HA_PAIR)
-            except (ActiveJobError, PendingJobError, Exception):
-                results["skipped_existing_job"] += 1
+        try:
+            _check_for_existing_jobs(
+                config, [serial_1, serial_2], constants.JOB_TYPE_HA_PAIR, job_index
+            )
+        except (ActiveJobError, PendingJobError, ConflictingJobTypeError):
+            results["skipped_existing_job"] += 1
+            if len(skipped_existing_job) < _PREVIEW_SKIPPED:
                 skipped_existing_job.append(f"{serial_1}/{serial_2}")
-                logger.info(f"Skipping pair: {serial} already has job")
-                skip_pair = True
-                break
-        
-        if skip_pair:
+            logger.info("Skipping pair: %s/%s already has job", serial_1, serial_2)
             continue
         
+        path_str = arrow_paths[version_1]
+        summary = f"{serial_1}/{serial_2}: {version_1} → {path_str}"
+        
         # Create job
         if not dry_run:
-            try:
-                job_id = f"csv-ha-{uuid.uuid4()}"
-                job_data = {
-                    "job_id": job_id,
-                    "type": constants.JOB_TYPE_HA_PAIR,
-                    "devices": [serial_1, serial_2],
-                    "ha_pair_name": "",
-                    "dry_run": False,
-                    "download_only": False,
-                    "created_at": datetime.now(timezone.utc).isoformat() + "Z"
-                }
-                
-                pending_dir = config.get_path(constants.DIR_QUEUE_PENDING)
-                job_file = pending_dir / f"{job_id}.json"
-                atomic_write_json(job_file, job_data)
-                
-                results["queued"] += 1
-                path_str = " → ".join(upgrade_paths[version_1])
-                queued_pairs.append(f"{serial_1}/{serial_2}: {version_1} → {path_str}")
-                logger.info(f"Queued HA pair {serial_1}/{serial_2} for upgrade")
-                
-            except Exception as e:
-                results["errors"] += 1
-                logger.error(f"Failed to queue pair {serial_1}/{serial_2}: {e}")
+            job_id = _new_job_id("csv-ha")
+            job_data = _build_job_data(
+                job_id, constants.JOB_TYPE_HA_PAIR, [serial_1, serial_2], False,
+                created_at=created_at
+            )
+            _add_to_job_index(job_index, "pending", job_data)
+            pending_jobs.append(
+                (pending_dir / f"{job_id}.json", job_data, f"HA pair {serial_1}/{serial_2}", summary)
+            )
         else:
             results["queued"] += 1
-            path_str = " → ".join(upgrade_paths[version_1])
-            queued_pairs.append(f"{serial_1}/{serial_2}: {version_1} → {path_str}")
+            if len(queued_pairs) < _PREVIEW_QUEUED:
+                queued_pairs.append(summary)
+    
+    _write_pending_jobs(
+        pending_jobs, results, "queued", queued_pairs, logger, "Queued %s for upgrade"
+    )
     
     # Display results
     if dry_run:
@@ -1250,28 +1457,24 @@ def upgrade_ha_pairs(ctx, csv_file, dry_run):
         click.echo("\nQueued HA pairs for upgrade:\n")
     
     if queued_pairs:
-        for pair in queued_pairs[:10]:
-            click.echo(f"  {pair}")
-        if len(queued_pairs) > 10:
-            click.echo(f"  ... and {len(queued_pairs) - 10} more")
+        click.echo("\n".join(f"  {pair}" for pair in queued_pairs))
+        if results["queued"] > _PREVIEW_QUEUED:
+            click.echo(f"  ... and {results['queued'] - _PREVIEW_QUEUED} more")
     
     # Show skipped
     if skipped_not_in_inventory:
         click.echo("\nSkipped (not in inventory):")
-        for item in skipped_not_in_inventory:
-            click.echo(f"  {item}")
+        click.echo("\n".join(f"  {item}" for item in skipped_not_in_inventory))
     
     if skipped_no_path:
         click.echo("\nSkipped (no upgrade path):")
-        for item in skipped_no_path:
-            click.echo(f"  {item}")
+        click.echo("\n".join(f"  {item}" for item in skipped_no_path))
     
     if skipped_existing_job:
         click.echo("\nSkipped (existing job):")
-        for item in skipped_existing_job[:5]:
-            click.echo(f"  {item}")
-        if len(skipped_existing_job) > 5:
-            click.echo(f"  ... and {len(skipped_existing_job) - 5} more")
+        click.echo("\n".join(f"  {item}" for item in skipped_existing_job))
+        if results["skipped_existing_job"] > _PREVIEW_SKIPPED:
+            click.echo(f"  ... and {results['skipped_existing_job'] - _PREVIEW_SKIPPED} more")
     
     # Summary
     click.echo(f"\nSummary:")
@@ -1312,12 +1515,9 @@ def download_ha_pairs(ctx, csv_file, dry_run):
         panos-upgrade download-ha-pairs ha_pairs.csv
         panos-upgrade download-ha-pairs ha_pairs.csv --dry-run
     """
-    import uuid
-    from datetime import datetime, timezone
     from panos_upgrade.device_inventory import DeviceInventory
-    from panos_upgrade.panorama_client import PanoramaClient
-    from panos_upgrade.utils.file_ops import atomic_write_json, safe_read_json
-    from panos_upgrade.exceptions import ActiveJobError, PendingJobError
+    from panos_upgrade.utils.file_ops import safe_read_json
+    from panos_upgrade.exceptions import ActiveJobError, PendingJobError, ConflictingJobTypeError
     from panos_upgrade import constants
     
     config = ctx.obj['config']
@@ -1334,18 +1534,22 @@ def download_ha_pairs(ctx, csv_file, dry_run):
     
     click.echo(f"Found {len(pairs)} HA pair(s) in CSV")
     
+    unique_pairs = _unique_ha_pairs(pairs)
+    if len(unique_pairs) < len(pairs):
+        click.echo(f"  Note: {len(pairs) - len(unique_pairs)} duplicate HA pair(s) ignored")
+        pairs = unique_pairs
+    
     # Load inventory for mgmt_ip lookup
     inventory_file = config.get_path("devices/inventory.json")
-    panorama = PanoramaClient(config)
     inventory = DeviceInventory(
-        inventory_file, 
-        panorama,
+        inventory_file,
         firewall_username=config.firewall_username,
         firewall_password=config.firewall_password
     )
     
-    # Load upgrade paths
+    # Load upgrade paths, joined once for the queued-device lines
     upgrade_paths = safe_read_json(config.upgrade_paths_file, default={})
+    arrow_paths = {version: " → ".join(path) for version, path in upgrade_paths.items()}
     
     # Track results
     results = {
@@ -1363,6 +1567,12 @@ def download_ha_pairs(ctx, csv_file, dry_run):
     skipped_no_path = []
     skipped_existing_job = []
     
+    # Scan the queues once for the whole batch
+    job_index = _build_job_index(config)
+    pending_dir = config.get_path(constants.DIR_QUEUE_PENDING)
+    pending_jobs = []
+    created_at = _utc_timestamp()
+    
     for serial_1, serial_2 in pairs:
         # Check if both devices are in inventory
         info_1 = inventory.get_device(serial_1)
@@ -1371,12 +1581,12 @@ def download_ha_pairs(ctx, csv_file, dry_run):
         if not info_1:
             results["skipped_not_in_inventory"] += 1
             skipped_not_in_inventory.append(serial_1)
-            logger.warning(f"Skipping device: {serial_1} not in inventory")
+            logger.warning("Skipping device: %s not in inventory", serial_1)
         
         if not info_2:
             results["skipped_not_in_inventory"] += 1
             skipped_not_in_inventory.append(serial_2)
-            logger.warning(f"Skipping device: {serial_2} not in inventory")
+            logger.warning("Skipping device: %s not in inventory", serial_2)
         
         # Process each device in the pair independently for download-only
         for serial, info in [(serial_1, info_1), (serial_2, info_2)]:
@@ -1387,51 +1597,43 @@ def download_ha_pairs(ctx, csv_file, dry_run):
             current_version = info.get("current_version", "unknown")
             
             # Check upgrade path
-            if current_version not in upgrade_paths:
+            if current_version not in arrow_paths:
                 results["skipped_no_path"] += 1
                 skipped_no_path.append(f"{serial} ({hostname}): version {current_version}")
-                logger.info(f"Skipping {serial}: No path for {current_version}")
+                logger.info("Skipping %s: No path for %s", serial, current_version)
                 continue
             
             # Check for existing jobs
             try:
-                _check_for_existing_job(config, serial, constants.JOB_TYPE_DOWNLOAD_ONLY)
-            except (ActiveJobError, PendingJobError, Exception):
+                _check_for_existing_job(
+                    config, serial, constants.JOB_TYPE_DOWNLOAD_ONLY, job_index
+                )
+            except (ActiveJobError, PendingJobError, ConflictingJobTypeError):
                 results["skipped_existing_job"] += 1
-                skipped_existing_job.append(f"{serial} ({hostname})")
-                logger.info(f"Skipping {serial}: Already has job")
+                if len(skipped_existing_job) < _PREVIEW_SKIPPED:
+                    skipped_existing_job.append(f"{serial} ({hostname})")
+                logger.info("Skipping %s: Already has job", serial)
                 continue
             
+            path_str = arrow_paths[current_version]
+            summary = f"{serial} ({hostname}): {current_version} → {path_str}"
+            
             # Create download-only job
             if not dry_run:
-                try:
-                    job_id = f"csv-ha-download-{uuid.uuid4()}"
-                    job_data = {
-                        "job_id": job_id,
-                        "type": constants.JOB_TYPE_DOWNLOAD_ONLY,
-                        "devices": [serial],
-                        "ha_pair_name": "",
-                        "dry_run": False,
-                        "download_only": True,
-                        "created_at": datetime.now(timezone.utc).isoformat() + "Z"
-                    }
-                    
-                    pending_dir = config.get_path(constants.DIR_QUEUE_PENDING)
-                    job_file = pending_dir / f"{job_id}.json"
-                    atomic_write_json(job_file, job_data)
-                    
-                    results["queued_devices"] += 1
-                    path_str = " → ".join(upgrade_paths[current_version])
-                    queued_devices.append(f"{serial} ({hostname}): {current_version} → {path_str}")
-                    logger.info(f"Queued {serial} for download-only")
-                    
-                except Exception as e:
-                    results["errors"] += 1
-                    logger.error(f"Failed to queue {serial}: {e}")
+                job_id = _new_job_id("csv-ha-download")
+                job_data = _build_job_data(
+                    job_id, constants.JOB_TYPE_DOWNLOAD_ONLY, [serial], False, True, created_at
+                )
+                _add_to_job_index(job_index, "pending", job_data)
+                pending_jobs.append((pending_dir / f"{job_id}.json", job_data, serial, summary))
             else:
                 results["queued_devices"] += 1
-                path_str = " → ".join(upgrade_paths[current_version])
-                queued_devices.append(f"{serial} ({hostname}): {current_version} → {path_str}")
+                if len(queued_devices) < _PREVIEW_QUEUED:
+                    queued_devices.append(summary)
+    
+    _write_pending_jobs(
+        pending_jobs, results, "queued_devices", queued_devices, logger, "Queued %s for download-only"
+    )
     
     # Display results
     if dry_run:
@@ -1440,30 +1642,26 @@ def download_ha_pairs(ctx, csv_file, dry_run):
         click.echo("\nQueued for download-only:\n")
     
     if queued_devices:
-        for device in queued_devices[:10]:
-            click.echo(f"  {device}")
-        if len(queued_devices) > 10:
-            click.echo(f"  ... and {len(queued_devices) - 10} more")
+        click.echo("\n".join(f"  {device}" for device in queued_devices))
+        if results["queued_devices"] > _PREVIEW_QUEUED:
+            click.echo(f"  ... and {results['queued_devices'] - _PREVIEW_QUEUED} more")
     
     # Show skipped
     if skipped_not_in_inventory:
         click.echo("\nSkipped (not in inventory):")
-        for item in skipped_not_in_inventory:
-            click.echo(f"  {item}")
+        click.echo("\n".join(f"  {item}" for item in skipped_not_in_inventory))
     
     if skipped_no_path:
         click.echo("\nSkipped (no upgrade path):")
-        for item in skipped_no_path[:5]:
-            click.echo(f"  {item}")
+        click.echo("\n".join(f"  {item}" for item in skipped_no_path[:5]))
         if len(skipped_no_path) > 5:
             click.echo(f"  ... and {len(skipped_no_path) - 5} more")
     
     if skipped_existing_job:
         click.echo("\nSkipped (existing job):")
-        for item in skipped_existing_job[:5]:
-            click.echo(f"  {item}")
-        if len(skipped_existing_job) > 5:
-            click.echo(f"  ... and {len(skipped_existing_job) - 5} more")
+        click.echo("\n".join(f"  {item}" for item in skipped_existing_job))
+        if results["skipped_existing_job"] > _PREVIEW_SKIPPED:
+            click.echo(f"  ... and {results['skipped_existing_job'] - _PREVIEW_SKIPPED} more")
     
     # Summary
     click.echo(f"\nSummary:")
@@ -1488,42 +1686,72 @@ def download_ha_pairs(ctx, csv_file, dry_run):
 @click.pass_context
 def download_status_cmd(ctx):
     """Show download progress summary."""
-    from panos_upgrade.utils.file_ops import safe_read_json
+    from collections import Counter
+    from panos_upgrade.utils.file_ops import iter_json_files, map_files
     from panos_upgrade import constants
     
     config = ctx.obj['config']
     
-    click.echo("Download Status Summary:")
-    
     # Count devices by status
     devices_dir = config.get_path(constants.DIR_STATUS_DEVICES)
     
-    if not devices_dir.exists():
-        click.echo("No device status files found")
+    # A missing directory lists as empty
+    status_files = list(iter_json_files(devices_dir))
+    if not status_files:
+        click.echo("Download Status Summary:\nNo device status files found")
         return
     
-    total = 0
-    download_complete = 0
-    downloading = 0
-    failed = 0
+    # Reads overlap on a thread pool; None marks files that are not counted
+    statuses = map_files(_read_upgrade_status, status_files)
+    status_counts = Counter(status for status in statuses if status is not None)
     
-    for status_file in devices_dir.glob("*.json"):
-        device_status = safe_read_json(status_file)
-        if device_status:
-            total += 1
-            status = device_status.get("upgrade_status", "")
-            
-            if status == constants.STATUS_DOWNLOAD_COMPLETE:
-                download_complete += 1
-            elif status == constants.STATUS_DOWNLOADING:
-                downloading += 1
-            elif status == constants.STATUS_FAILED:
-                failed += 1
+    # One write, so piped or watched output never shows a partial summary
+    click.echo("\n".join([
+        "Download Status Summary:",
+        f"  Total devices tracked: {sum(status_counts.values())}",
+        f"  Download complete: {status_counts[constants.STATUS_DOWNLOAD_COMPLETE]}",
+        f"  Currently downloading: {status_counts[constants.STATUS_DOWNLOADING]}",
+        f"  Failed: {status_counts[constants.STATUS_FAILED]}",
+    ]))
+
+
+_UPGRADE_STATUS_PATTERN = re.compile(rb'"upgrade_status"\s*:\s*"([^"\\]*)"')
+
+
+def _read_upgrade_status(status_file):
+    """
+    Read the top-level upgrade_status of a device status file.
+    
+    Device status files only need this one field for the download summary,
+    so it is pulled out with a regex instead of parsing the whole document.
+    Files where the pattern does not match are parsed as JSON.
+    
+    Args:
+        status_file: Path to device status file
+        
+    Returns:
+        Upgrade status string ("" if absent), or None for missing files
+        and empty documents
+    """
+    from panos_upgrade.utils.file_ops import loads_json, read_file_bytes
     
-    click.echo(f"  Total devices tracked: {total}")
-    click.echo(f"  Download complete: {download_complete}")
-    click.echo(f"  Currently downloading: {downloading}")
-    click.echo(f"  Failed: {failed}")
+    try:
+        raw = read_file_bytes(status_file)
+    except FileNotFoundError:
+        return None
+    
+    match = _UPGRADE_STATUS_PATTERN.search(raw)
+    if match:
+        return match.group(1).decode()
+    
+    try:
+        device_status = loads_json(raw)
+    except ValueError as e:
+        raise ValueError(f"Invalid JSON in {status_file}: {e}")
+    
+    if not device_status:
+        return None
+    return device_status.get("upgrade_status", "")
 
 
 @main.command(name='verify-download')
@@ -1549,11 +1777,9 @@ def verify_download(ctx, output, workers):
         panos-upgrade verify-download --output my_report.csv
         panos-upgrade verify-download --workers 10
     """
-    import csv
     from datetime import datetime
     from concurrent.futures import ThreadPoolExecutor, as_completed
     from panos_upgrade.device_inventory import DeviceInventory
-    from panos_upgrade.panorama_client import PanoramaClient
     from panos_upgrade.direct_firewall_client import DirectFirewallClient
     from panos_upgrade.utils.file_ops import safe_read_json
     
@@ -1571,10 +1797,8 @@ def verify_download(ctx, output, workers):
     
     # Load inventory
     inventory_file = config.get_path("devices/inventory.json")
-    panorama = PanoramaClient(config)
     inventory = DeviceInventory(
         inventory_file,
-        panorama,
         firewall_username=config.firewall_username,
         firewall_password=config.firewall_password
     )
@@ -7,6 +7,9 @@ from typing import Any, Dict, Optional
 from panos_upgrade import constants
 from panos_upgrade.utils.file_ops import atomic_write_json, safe_read_json, ensure_directory_structure
 
+# Cached result for dot-notation keys that are not present in the config
+_MISSING = object()
+
 
 class Config:
     """Application configuration manager."""
@@ -30,11 +33,18 @@ class Config:
             self.config_file = self.work_dir / constants.CONFIG_SUBDIR / constants.CONFIG_FILE_NAME
         
         self._config: Dict[str, Any] = {}
+        self._cache: Dict[str, Any] = {}
+        self._dirty = False
         self._load_config()
     
     def _load_config(self) -> None:
         """Load configuration from file or create default."""
-        self._config = safe_read_json(self.config_file, self._get_default_config())
+        # Only build the default dict when there is no config file to read
+        if self.config_file.exists():
+            self._config = safe_read_json(self.config_file)
+        else:
+            self._config = self._get_default_config()
+        self._cache.clear()
         
         # Ensure work directory structure exists
         self._ensure_directories()
@@ -110,11 +120,37 @@ class Config:
             constants.DIR_COMMANDS_INCOMING,
             constants.DIR_COMMANDS_PROCESSED,
         ]
+        
+        # The marker records which directories were created; when it matches
+        # and none have been removed since, skip the mkdir calls that every
+        # CLI invocation would otherwise repeat
+        marker_file = self.work_dir / constants.INITIALIZED_MARKER_FILE
+        expected = "\n".join(directories) + "\n"
+        try:
+            if marker_file.read_text() == expected and all(
+                os.path.isdir(self.work_dir / directory) for directory in directories
+            ):
+                return
+        except OSError:
+            pass
+        
         ensure_directory_structure(self.work_dir, directories)
+        
+        try:
+            marker_file.write_text(expected)
+        except OSError:
+            # Read-only work dirs still work, they just re-check every time
+            pass
     
     def save(self) -> None:
         """Save configuration to file."""
         atomic_write_json(self.config_file, self._config)
+        self._dirty = False
+    
+    def flush(self) -> None:
+        """Save configuration if set() left unsaved changes."""
+        if self._dirty:
+            self.save()
     
     def get(self, key: str, default: Any = None) -> Any:
         """
@@ -127,24 +163,47 @@ class Config:
         Returns:
             Configuration value
         """
-        keys = key.split('.')
+        # Resolved lookups are cached until the config is reloaded or set()
+        try:
+            value = self._cache[key]
+        except KeyError:
+            value = self._cache[key] = self._lookup(key)
+        
+        return default if value is _MISSING else value
+    
+    def _lookup(self, key: str) -> Any:
+        """
+        Walk the config dict for a dot-notation key.
+        
+        Args:
+            key: Configuration key (e.g., "panorama.host")
+            
+        Returns:
+            Configuration value, or _MISSING if the key is not present
+        """
         value = self._config
         
-        for k in keys:
-            if isinstance(value, dict) and k in value:
+        try:
+            for k in key.split('.'):
                 value = value[k]
-            else:
-                return default
+        except (KeyError, TypeError):
+            # Missing key, or a hop into a non-dict value
+            return _MISSING
         
         return value
     
-    def set(self, key: str, value: Any) -> None:
+    def set(self, key: str, value: Any, save: bool = True) -> None:
         """
         Set configuration value by dot-notation key.
         
+        Setting a key to its current value (same type and value) does not
+        rewrite the file unless it is missing or has other unsaved changes.
+        
         Args:
             key: Configuration key (e.g., "panorama.host")
             value: Value to set
+            save: Write the file now; pass False to batch several changes
+                and call flush() afterwards
         """
         keys = key.split('.')
         config = self._config
@@ -155,9 +214,16 @@ class Config:
                 config[k] = {}
             config = config[k]
         
-        # Set the value
-        config[keys[-1]] = value
-        self.save()
+        # Skip an unchanged value, but 1 -> True or 5 -> 5.0 is still a change
+        old = config.get(keys[-1], _MISSING)
+        if type(old) is not type(value) or old != value:
+            config[keys[-1]] = value
+            self._cache.clear()
+            self._dirty = True
+        
+        # Also flush earlier save=False changes, or create a missing file
+        if save and (self._dirty or not self.config_file.exists()):
+            self.save()
     
     def get_path(self, relative_path: str) -> Path:
         """
@@ -35,6 +35,9 @@ DIR_COMMANDS = "commands"
 DIR_COMMANDS_INCOMING = "commands/incoming"
 DIR_COMMANDS_PROCESSED = "commands/processed"
 
+# Marker written once the work directory structure has been created
+INITIALIZED_MARKER_FILE = ".initialized"
+
 # Status files
 STATUS_DAEMON_FILE = "status/daemon.json"
 STATUS_WORKERS_FILE = "status/workers.json"
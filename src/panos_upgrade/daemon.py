@@ -15,11 +15,14 @@ from panos_upgrade.config import Config, get_config
 from panos_upgrade.logging_config import setup_logging, get_logger
 from panos_upgrade.worker_pool import WorkerPool
 from panos_upgrade.models import DaemonStatus, WorkerStatus, Job, CancelCommand
-from panos_upgrade.utils.file_ops import atomic_write_json, read_json, safe_read_json
+from panos_upgrade.utils.file_ops import (
+    atomic_write_json, count_json_files, iter_json_files, read_json, safe_read_json
+)
 from panos_upgrade.panorama_client import PanoramaClient
 from panos_upgrade.validation import ValidationSystem
 from panos_upgrade.upgrade_manager import UpgradeManager
 from panos_upgrade.device_inventory import DeviceInventory
+from panos_upgrade.exceptions import ConfigurationError
 from panos_upgrade import constants
 
 
@@ -41,12 +44,51 @@ class CommandQueueHandler(FileSystemEventHandler):
         if event.is_directory:
             return
         
-        file_path = Path(event.src_path)
+        self._handle_command_file(Path(event.src_path))
+    
+    def on_moved(self, event: FileSystemEvent):
+        """Handle a file renamed into the command queue (atomic writes)."""
+        if event.is_directory or not event.dest_path:
+            return
+        
+        self._handle_command_file(Path(event.dest_path))
+    
+    def _handle_command_file(self, file_path: Path):
+        """Process a visible JSON command file; temp files are ignored."""
         if file_path.suffix == '.json' and not file_path.name.startswith('.'):
             self.logger.info(f"New command file detected: {file_path.name}")
             self.daemon.process_command(file_path)
 
 
+class PendingQueueHandler(FileSystemEventHandler):
+    """Handler that wakes the job processor when a pending job file appears."""
+    
+    def __init__(self, wakeup: threading.Event):
+        """
+        Initialize handler.
+        
+        Args:
+            wakeup: Event set whenever a job file lands in the pending queue
+        """
+        self.wakeup = wakeup
+    
+    def on_created(self, event: FileSystemEvent):
+        """Handle file creation in the pending queue."""
+        if not event.is_directory:
+            self._notify(event.src_path)
+    
+    def on_moved(self, event: FileSystemEvent):
+        """Handle a file renamed into the pending queue (atomic writes)."""
+        if not event.is_directory and event.dest_path:
+            self._notify(event.dest_path)
+    
+    def _notify(self, path: str):
+        """Wake the job processor for visible JSON files."""
+        name = os.path.basename(path)
+        if name.endswith('.json') and not name.startswith('.'):
+            self.wakeup.set()
+
+
 class UpgradeDaemon:
     """Main daemon service for managing PAN-OS upgrades."""
     
@@ -70,6 +112,7 @@ class UpgradeDaemon:
         self._running = False
         self._stop_event = threading.Event()
         self._status_lock = threading.Lock()
+        self._queue_count_cache = {}
         self._daemon_status = DaemonStatus(
             running=False,
             workers=self.config.max_workers,
@@ -83,6 +126,13 @@ class UpgradeDaemon:
         # Command queue monitoring
         self._observer: Optional[Observer] = None
         
+        # Set by the pending queue watch so new jobs are picked up immediately
+        self._pending_wakeup = threading.Event()
+        
+        # Set by worker status changes; workers.json is only rewritten when set
+        self._worker_status_dirty = threading.Event()
+        self._worker_status_dirty.set()
+        
         # Rate limiting
         self._rate_limiter = RateLimiter(self.config.rate_limit)
         
@@ -127,6 +177,7 @@ class UpgradeDaemon:
         
         # Start command queue monitoring
         self._start_command_queue_monitor()
+        self._start_pending_queue_monitor()
         
         # Start job queue processor
         self._job_processor_thread = threading.Thread(
@@ -164,6 +215,7 @@ class UpgradeDaemon:
         self.logger.info("Stopping PAN-OS upgrade daemon")
         self._running = False
         self._stop_event.set()
+        self._pending_wakeup.set()
         
         # Stop command queue monitoring
         if self._observer:
@@ -197,9 +249,18 @@ class UpgradeDaemon:
         self._observer.start()
         
         # Process any existing commands
-        for file_path in command_dir.glob("*.json"):
-            if not file_path.name.startswith('.'):
-                self.process_command(file_path)
+        for file_path in list(iter_json_files(command_dir)):
+            self.process_command(Path(file_path))
+    
+    def _start_pending_queue_monitor(self):
+        """Watch the pending queue so the job processor wakes on new jobs."""
+        pending_dir = self.config.get_path(constants.DIR_QUEUE_PENDING)
+        
+        self.logger.info(f"Starting pending queue monitor: {pending_dir}")
+        
+        self._observer.schedule(
+            PendingQueueHandler(self._pending_wakeup), str(pending_dir), recursive=False
+        )
     
     def process_command(self, command_file: Path):
         """
@@ -244,9 +305,12 @@ class UpgradeDaemon:
         
         while not self._stop_event.is_set():
             try:
+                # Clear before scanning so a job landing mid-scan still wakes us
+                self._pending_wakeup.clear()
+                
                 # Check for pending jobs
                 pending_dir = self.config.get_path(constants.DIR_QUEUE_PENDING)
-                job_files = sorted(pending_dir.glob("*.json"))
+                job_files = [Path(p) for p in sorted(iter_json_files(pending_dir))]
                 
                 for job_file in job_files:
                     if self._stop_event.is_set():
@@ -271,6 +335,7 @@ class UpgradeDaemon:
                                     device_serial,
                                     self._execute_upgrade_with_completion,
                                     job.job_id,
+                                    job_data,
                                     self.upgrade_manager.upgrade_device,
                                     device_serial,
                                     job.job_id,
@@ -286,6 +351,7 @@ class UpgradeDaemon:
                                     job.devices[0],
                                     self._execute_upgrade_with_completion,
                                     job.job_id,
+                                    job_data,
                                     self.upgrade_manager.upgrade_ha_pair,
                                     job.devices[0],
                                     job.devices[1],
@@ -302,6 +368,7 @@ class UpgradeDaemon:
                                     device_serial,
                                     self._execute_upgrade_with_completion,
                                     job.job_id,
+                                    job_data,
                                     self.upgrade_manager.download_only_device,
                                     device_serial,
                                     job.job_id,
@@ -313,8 +380,9 @@ class UpgradeDaemon:
                     except Exception as e:
                         self.logger.error(f"Error processing job {job_file}: {e}", exc_info=True)
                 
-                # Sleep before next check
-                time.sleep(5)
+                # Wait for a new pending job; rescan periodically regardless
+                # in case a filesystem event was missed
+                self._pending_wakeup.wait(timeout=5)
                 
             except Exception as e:
                 self.logger.error(f"Error in job queue processor: {e}", exc_info=True)
@@ -328,7 +396,8 @@ class UpgradeDaemon:
             try:
                 self._update_queue_counts()
                 self._save_daemon_status()
-                self._save_worker_statuses()
+                if self._worker_status_dirty.is_set():
+                    self._save_worker_statuses()
                 time.sleep(5)
             except Exception as e:
                 self.logger.error(f"Error updating status: {e}", exc_info=True)
@@ -341,10 +410,12 @@ class UpgradeDaemon:
             completed_dir = self.config.get_path(constants.DIR_QUEUE_COMPLETED)
             cancelled_dir = self.config.get_path(constants.DIR_QUEUE_CANCELLED)
             
-            self._daemon_status.pending_jobs = len(list(pending_dir.glob("*.json")))
-            self._daemon_status.active_jobs = len(list(active_dir.glob("*.json")))
-            self._daemon_status.completed_jobs = len(list(completed_dir.glob("*.json")))
-            self._daemon_status.cancelled_jobs = len(list(cancelled_dir.glob("*.json")))
+            # Unchanged queue directories are counted from cache with one stat()
+            cache = self._queue_count_cache
+            self._daemon_status.pending_jobs = count_json_files(pending_dir, cache)
+            self._daemon_status.active_jobs = count_json_files(active_dir, cache)
+            self._daemon_status.completed_jobs = count_json_files(completed_dir, cache)
+            self._daemon_status.cancelled_jobs = count_json_files(cancelled_dir, cache)
             self._daemon_status.last_updated = datetime.now(timezone.utc).isoformat() + "Z"
     
     def _save_daemon_status(self):
@@ -356,15 +427,20 @@ class UpgradeDaemon:
     def _save_worker_statuses(self):
         """Save worker statuses to file."""
         status_file = self.config.get_path(constants.STATUS_WORKERS_FILE)
+        # Clear first so a change made while writing is saved on the next tick
+        self._worker_status_dirty.clear()
         statuses = [ws.to_dict() for ws in self.worker_pool.get_worker_statuses()]
         atomic_write_json(status_file, {"workers": statuses})
     
-    def _execute_upgrade_with_completion(self, job_id: str, upgrade_func, *args, **kwargs):
+    def _execute_upgrade_with_completion(self, job_id: str, job_data: dict,
+                                         upgrade_func, *args, **kwargs):
         """
         Execute upgrade and handle job completion.
         
         Args:
             job_id: Job identifier
+            job_data: Job file contents parsed at pickup, reused to record
+                completion without re-reading the file
             upgrade_func: Upgrade function to execute
             *args: Arguments for upgrade function
             **kwargs: Keyword arguments for upgrade function
@@ -395,15 +471,16 @@ class UpgradeDaemon:
                         dest_dir = self.config.get_path(constants.DIR_QUEUE_COMPLETED)
                         self.logger.info(f"Job {job_id} failed: {message}")
             
-            # Move job file
+            # Claim the job file with one atomic rename; if another completion
+            # of the same job got there first, it records the result
             dest_file = dest_dir / job_file.name
-            job_file.rename(dest_file)
+            try:
+                job_file.rename(dest_file)
+            except FileNotFoundError:
+                self.logger.warning(f"Job {job_id} was already moved by another completion")
+                return
             
             # Update job data with completion info
-            from panos_upgrade.utils.file_ops import read_json, atomic_write_json
-            from datetime import datetime
-            
-            job_data = read_json(dest_file)
             job_data["completed_at"] = datetime.now(timezone.utc).isoformat() + "Z"
             job_data["status"] = "complete" if success else "failed"
             atomic_write_json(dest_file, job_data)
@@ -414,8 +491,8 @@ class UpgradeDaemon:
     def _worker_status_callback(self, worker_status: WorkerStatus):
         """Callback for worker status updates."""
         # This is called frequently, so we don't save to disk here
-        # The status updater thread will handle periodic saves
-        pass
+        # The status updater thread will save on its next tick
+        self._worker_status_dirty.set()
 
 
 class RateLimiter:
@@ -427,43 +504,58 @@ class RateLimiter:
         
         Args:
             requests_per_minute: Maximum requests per minute
+            
+        Raises:
+            ConfigurationError: If requests_per_minute is not positive
         """
+        if requests_per_minute <= 0:
+            raise ConfigurationError(
+                f"panorama.rate_limit must be greater than 0 (got {requests_per_minute})"
+            )
+        
         self.requests_per_minute = requests_per_minute
         self.tokens = requests_per_minute
-        self.last_update = time.time()
+        self.last_update = time.monotonic()
         self.lock = threading.Lock()
     
     def acquire(self, blocking: bool = True) -> bool:
         """
         Acquire a token for making a request.
         
+        A blocking caller that finds the bucket empty reserves the next token
+        by taking the balance below zero, then sleeps exactly until that token
+        has accrued. Waiters are served in arrival order and never poll.
+        
         Args:
             blocking: Whether to block until a token is available
             
         Returns:
             True if token acquired, False otherwise
         """
-        while True:
-            with self.lock:
-                now = time.time()
-                elapsed = now - self.last_update
-                
-                # Add tokens based on elapsed time
-                self.tokens = min(
-                    self.requests_per_minute,
-                    self.tokens + (elapsed * self.requests_per_minute / 60.0)
-                )
-                self.last_update = now
-                
-                if self.tokens >= 1.0:
-                    self.tokens -= 1.0
-                    return True
-                
-                if not blocking:
-                    return False
+        with self.lock:
+            now = time.monotonic()
+            elapsed = now - self.last_update
             
-            # Wait a bit before trying again
-            time.sleep(0.1)
+            # Add tokens based on elapsed time
+            self.tokens = min(
+                self.requests_per_minute,
+                self.tokens + (elapsed * self.requests_per_minute / 60.0)
+            )
+            self.last_update = now
+            
+            if self.tokens >= 1.0:
+                self.tokens -= 1.0
+                return True
+            
+            if not blocking:
+                return False
+            
+            # Reserve the next token; the deficit covers every earlier waiter
+            self.tokens -= 1.0
+            wait = -self.tokens * 60.0 / self.requests_per_minute
+        
+        time.sleep(wait)
+        return True
 
 
 def run_daemon():
@@ -1,16 +1,19 @@
 """Device inventory management."""
 
+import os
 import threading
 import time
 from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Dict, List, Optional, Any, Callable, Tuple
+from typing import TYPE_CHECKING, Dict, List, Optional, Any, Callable, Tuple
 
 from panos_upgrade.logging_config import get_logger
 from panos_upgrade.utils.file_ops import atomic_write_json, safe_read_json
-from panos_upgrade.panorama_client import PanoramaClient
-from panos_upgrade.exceptions import DeviceNotFoundError
+from panos_upgrade.exceptions import ConfigurationError, DeviceNotFoundError
+
+if TYPE_CHECKING:
+    from panos_upgrade.panorama_client import PanoramaClient
 
 
 # Device type constants
@@ -31,7 +34,7 @@ class DeviceInventory:
     def __init__(
         self, 
         inventory_file: Path, 
-        panorama_client: PanoramaClient,
+        panorama_client: Optional["PanoramaClient"] = None,
         firewall_username: str = "",
         firewall_password: str = ""
     ):
@@ -40,7 +43,8 @@ class DeviceInventory:
         
         Args:
             inventory_file: Path to inventory.json
-            panorama_client: Panorama client instance
+            panorama_client: Panorama client instance; only needed for
+                discover_devices(), so read-only users can omit it
             firewall_username: Username for direct firewall connections
             firewall_password: Password for direct firewall connections
         """
@@ -50,13 +54,34 @@ class DeviceInventory:
         self.firewall_password = firewall_password
         self.logger = get_logger("panos_upgrade.inventory")
         self._inventory: Dict[str, Dict[str, Any]] = {}
+        self._file_stamp: Optional[Tuple[int, int, int]] = None
+        # current_version -> serials, built on first use and reset on change
+        self._by_version: Optional[Dict[str, List[str]]] = None
         self._load_inventory()
     
+    def _stat_stamp(self) -> Optional[Tuple[int, int, int]]:
+        """
+        Get the (inode, mtime_ns, size) stamp of the inventory file.
+        
+        Saves go through an atomic rename, so the inode changes on every
+        rewrite even when the mtime granularity is coarse.
+        
+        Returns:
+            Stamp tuple, or None if the file does not exist
+        """
+        try:
+            st = os.stat(self.inventory_file)
+        except OSError:
+            return None
+        return (st.st_ino, st.st_mtime_ns, st.st_size)
+    
     def _load_inventory(self):
         """Load inventory from file."""
         try:
+            self._file_stamp = self._stat_stamp()
             data = safe_read_json(self.inventory_file, default={})
             self._inventory = data.get("devices", {})
+            self._by_version = None
             last_updated = data.get("last_updated", "never")
             self.logger.debug(
                 f"Loaded inventory: {len(self._inventory)} devices "
@@ -65,9 +90,13 @@ class DeviceInventory:
         except Exception as e:
             self.logger.error(f"Failed to load inventory: {e}")
             self._inventory = {}
+            self._by_version = None
+            self._file_stamp = None
     
     def reload(self):
-        """Reload inventory from disk."""
+        """Reload inventory from disk if the file changed since the last load."""
+        if self._file_stamp is not None and self._stat_stamp() == self._file_stamp:
+            return
         self._load_inventory()
     
     def _query_ha_state_with_retry(
@@ -163,7 +192,13 @@ class DeviceInventory:
         
         Returns:
             Dictionary with discovery statistics
+            
+        Raises:
+            ConfigurationError: If the inventory was created without a Panorama client
         """
+        if self.panorama is None:
+            raise ConfigurationError("Device discovery requires a Panorama client")
+        
         self.logger.info(f"Discovering devices from Panorama (workers: {max_workers})...")
         
         try:
@@ -272,6 +307,8 @@ class DeviceInventory:
                     "discovered_at": datetime.now(timezone.utc).isoformat() + "Z"
                 }
             
+            self._by_version = None
+            
             # Save inventory
             self._save_inventory()
             
@@ -297,6 +334,7 @@ class DeviceInventory:
         }
         
         atomic_write_json(self.inventory_file, data)
+        self._file_stamp = self._stat_stamp()
         self.logger.debug(f"Saved inventory: {len(self._inventory)} devices")
     
     def get_device(self, serial: str) -> Optional[Dict[str, Any]]:
@@ -348,10 +386,13 @@ class DeviceInventory:
         Returns:
             List of devices with that version
         """
-        return [
-            device for device in self._inventory.values()
-            if device.get("current_version") == version
-        ]
+        if self._by_version is None:
+            by_version: Dict[str, List[str]] = {}
+            for serial, device in self._inventory.items():
+                by_version.setdefault(device.get("current_version"), []).append(serial)
+            self._by_version = by_version
+        
+        return [self._inventory[serial] for serial in self._by_version.get(version, ())]
     
     def count(self) -> int:
         """Get total device count."""
@@ -3,8 +3,62 @@
 import json
 import os
 import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Any, Dict
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+try:
+    import orjson
+except ImportError:  # Optional dependency: pip install panos-upgrade[fast]
+    orjson = None
+
+# Minimum number of files before map_files()/write_json_files() use a thread pool
+_PARALLEL_READ_THRESHOLD = 8
+
+# Size of each os.read() in read_file_bytes(); larger than any job file
+_READ_CHUNK_SIZE = 65536
+
+# Age after which count_json_files() trusts a directory's mtime (1 second)
+_SETTLED_DIR_NS = 1_000_000_000
+
+
+def dumps_json(data: Any) -> bytes:
+    """
+    Serialize data to indented, key-sorted JSON bytes.
+    
+    Uses orjson when installed, otherwise the standard library.
+    
+    Args:
+        data: JSON-serializable data
+        
+    Returns:
+        UTF-8 encoded JSON
+    """
+    if orjson is not None:
+        return orjson.dumps(
+            data,
+            option=orjson.OPT_INDENT_2 | orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS
+        )
+    return json.dumps(data, indent=2, sort_keys=True).encode('utf-8')
+
+
+def loads_json(raw: bytes) -> Any:
+    """
+    Parse JSON from bytes.
+    
+    Uses orjson when installed, otherwise the standard library. Both raise
+    a json.JSONDecodeError subclass on invalid input.
+    
+    Args:
+        raw: UTF-8 encoded JSON
+        
+    Returns:
+        Parsed data
+    """
+    if orjson is not None:
+        return orjson.loads(raw)
+    return json.loads(raw)
 
 
 def atomic_write_json(file_path: Path, data: Dict[str, Any]) -> None:
@@ -29,8 +83,8 @@ def atomic_write_json(file_path: Path, data: Dict[str, Any]) -> None:
     )
     
     try:
-        with os.fdopen(fd, 'w') as f:
-            json.dump(data, f, indent=2, sort_keys=True)
+        with os.fdopen(fd, 'wb') as f:
+            f.write(dumps_json(data))
             f.flush()
             os.fsync(f.fileno())
         
@@ -59,8 +113,39 @@ def read_json(file_path: Path) -> Dict[str, Any]:
         FileNotFoundError: If file doesn't exist
         json.JSONDecodeError: If file contains invalid JSON
     """
-    with open(file_path, 'r') as f:
-        return json.load(f)
+    return loads_json(read_file_bytes(file_path))
+
+
+def read_file_bytes(file_path: Path) -> bytes:
+    """
+    Read a whole file as bytes with raw os.read() calls.
+    
+    Job and status files are a few KB, so one read usually covers them;
+    this skips the buffered file object that open() would build.
+    
+    Args:
+        file_path: Path to file
+        
+    Returns:
+        File contents
+        
+    Raises:
+        FileNotFoundError: If file doesn't exist
+    """
+    fd = os.open(file_path, os.O_RDONLY)
+    try:
+        data = os.read(fd, _READ_CHUNK_SIZE)
+        if len(data) < _READ_CHUNK_SIZE:
+            return data
+        
+        chunks = [data]
+        while True:
+            chunk = os.read(fd, _READ_CHUNK_SIZE)
+            if not chunk:
+                return b"".join(chunks)
+            chunks.append(chunk)
+    finally:
+        os.close(fd)
 
 
 def safe_read_json(file_path: Path, default: Dict[str, Any] = None) -> Dict[str, Any]:
@@ -85,6 +170,225 @@ def safe_read_json(file_path: Path, default: Dict[str, Any] = None) -> Dict[str,
         raise ValueError(f"Invalid JSON in {file_path}: {e}")
 
 
+def read_json_files(
+    file_paths: Sequence[Path],
+    max_workers: int = 8,
+    must_contain: Sequence[bytes] = ()
+) -> Iterator[Optional[Any]]:
+    """
+    Read many JSON files, overlapping file I/O with a thread pool.
+    
+    Results are yielded in the same order as file_paths. Files that have
+    disappeared or contain invalid JSON yield None. If the caller stops
+    iterating early, reads that have not started yet are cancelled.
+    
+    Args:
+        file_paths: Paths of JSON files to read
+        max_workers: Maximum number of reader threads
+        must_contain: If given, files whose raw bytes contain none of these
+            byte strings yield None without being parsed
+        
+    Yields:
+        Parsed JSON data, or None for unreadable or filtered-out files
+    """
+    def _read(file_path):
+        try:
+            raw = read_file_bytes(file_path)
+            if must_contain and not any(needle in raw for needle in must_contain):
+                return None
+            return loads_json(raw)
+        except (OSError, ValueError):
+            return None
+    
+    yield from map_files(_read, file_paths, max_workers)
+
+
+def map_files(
+    func: Callable[[Path], Any],
+    file_paths: Sequence[Path],
+    max_workers: int = 8
+) -> Iterator[Any]:
+    """
+    Apply a file-reading function to many paths, overlapping I/O with threads.
+    
+    Results are yielded in the same order as file_paths. Short lists are
+    processed in the calling thread. An exception raised by func is
+    re-raised when its result is reached. If the caller stops iterating
+    early, calls that have not started yet are cancelled.
+    
+    Args:
+        func: Function called with each path
+        file_paths: Paths to process
+        max_workers: Maximum number of reader threads
+        
+    Yields:
+        func's result for each path
+    """
+    # Thread start-up is not worth it for a handful of small files
+    if len(file_paths) < _PARALLEL_READ_THRESHOLD:
+        for file_path in file_paths:
+            yield func(file_path)
+        return
+    
+    executor = ThreadPoolExecutor(max_workers=min(max_workers, len(file_paths)))
+    try:
+        yield from executor.map(func, file_paths)
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
+
+
+def write_json_files(
+    items: Sequence[Tuple[Path, Any]],
+    max_workers: int = 8
+) -> List[Optional[Exception]]:
+    """
+    Atomically write many JSON files as one batch.
+    
+    Every file is first written to a temporary file, then all temporary
+    files are fsynced (overlapped on a thread pool), then renamed into
+    place, and finally each parent directory is fsynced once so the
+    renames are durable too. Readers see each file appear complete, as
+    with atomic_write_json(). A failure on one file does not stop the
+    others.
+    
+    Args:
+        items: (file_path, data) pairs to write
+        max_workers: Maximum number of fsync threads
+        
+    Returns:
+        One entry per item, in order: None on success, else the exception raised
+    """
+    results: List[Optional[Exception]] = [None] * len(items)
+    staged = []
+    
+    # Write all temporary files before syncing any of them, so the kernel
+    # can schedule the data writeback together
+    for index, (file_path, data) in enumerate(items):
+        file_path = Path(file_path)
+        try:
+            file_path.parent.mkdir(parents=True, exist_ok=True)
+            fd, temp_path = tempfile.mkstemp(
+                dir=file_path.parent,
+                prefix=f".{file_path.name}.",
+                suffix=".tmp"
+            )
+            try:
+                with os.fdopen(fd, 'wb') as f:
+                    f.write(dumps_json(data))
+            except Exception:
+                os.unlink(temp_path)
+                raise
+            staged.append((index, temp_path, file_path))
+        except Exception as e:
+            results[index] = e
+    
+    def _sync(temp_path):
+        try:
+            fd = os.open(temp_path, os.O_RDONLY)
+            try:
+                os.fsync(fd)
+            finally:
+                os.close(fd)
+            return None
+        except OSError as e:
+            return e
+    
+    temp_paths = [temp_path for _, temp_path, _ in staged]
+    if len(staged) < _PARALLEL_READ_THRESHOLD:
+        sync_errors = [_sync(temp_path) for temp_path in temp_paths]
+    else:
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(staged))) as executor:
+            sync_errors = list(executor.map(_sync, temp_paths))
+    
+    directories = set()
+    for (index, temp_path, file_path), error in zip(staged, sync_errors):
+        try:
+            if error:
+                raise error
+            os.replace(temp_path, file_path)
+            directories.add(file_path.parent)
+        except Exception as e:
+            results[index] = e
+            try:
+                os.unlink(temp_path)
+            except OSError:
+                pass
+    
+    for directory in directories:
+        try:
+            dir_fd = os.open(directory, os.O_RDONLY)
+        except OSError:
+            # Directories cannot be opened for fsync on every platform
+            continue
+        try:
+            os.fsync(dir_fd)
+        except OSError:
+            pass
+        finally:
+            os.close(dir_fd)
+    
+    return results
+
+
+def iter_json_files(directory: Path) -> Iterator[str]:
+    """
+    Iterate over JSON files in a directory using a single scandir pass.
+    
+    Hidden files (including in-progress atomic write temp files) and
+    non-regular files are skipped. A missing directory yields nothing.
+    
+    Args:
+        directory: Directory to scan
+        
+    Yields:
+        Path strings of the JSON files found
+    """
+    try:
+        with os.scandir(directory) as entries:
+            for entry in entries:
+                name = entry.name
+                if (name.endswith('.json') and not name.startswith('.')
+                        and entry.is_file(follow_symlinks=False)):
+                    yield entry.path
+    except FileNotFoundError:
+        return
+
+
+def count_json_files(directory: Path, cache: Optional[Dict[str, Tuple[int, int]]] = None) -> int:
+    """
+    Count the JSON files iter_json_files() would yield for a directory.
+    
+    With a cache, the directory is only rescanned when its mtime has changed
+    since the cached count. Adding, removing or renaming entries always
+    updates a directory's mtime, so an unchanged queue costs one stat().
+    Directories modified within the last second are not cached, because a
+    coarse-grained filesystem clock could hide a further change.
+    
+    Args:
+        directory: Directory to count
+        cache: Optional dict of directory -> (mtime_ns, count), updated in place
+        
+    Returns:
+        Number of JSON files (0 for a missing directory)
+    """
+    key = str(directory)
+    try:
+        mtime_ns = os.stat(key).st_mtime_ns
+    except FileNotFoundError:
+        return 0
+    
+    if cache is not None:
+        cached = cache.get(key)
+        if cached and cached[0] == mtime_ns:
+            return cached[1]
+    
+    count = sum(1 for _ in iter_json_files(directory))
+    
+    if cache is not None and time.time_ns() - mtime_ns > _SETTLED_DIR_NS:
+        cache[key] = (mtime_ns, count)
+    return count
+
+
 def ensure_directory_structure(base_path: Path, directories: list[str]) -> None:
     """
     Ensure all required directories exist.
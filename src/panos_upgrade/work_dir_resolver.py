@@ -7,6 +7,8 @@ from enum import Enum
 from pathlib import Path
 from typing import Optional
 
+from panos_upgrade.constants import DEFAULT_WORK_DIR
+
 
 class ConfigSource(Enum):
     """Source of work directory configuration."""
@@ -33,9 +35,6 @@ ENV_VAR_NAME = "PANOS_UPGRADE_HOME"
 # User config file name
 USER_CONFIG_FILE = ".panos-upgrade.config.json"
 
-# Default work directory
-DEFAULT_WORK_DIR = Path("/opt/panos-upgrade")
-
 
 def get_user_config_path() -> Path:
     """Get path to user config file in home directory."""
@@ -0,0 +1,189 @@
+"""Tests for CSV bulk job submission commands."""
+
+import json
+import click
+import pytest
+from click.testing import CliRunner
+
+from panos_upgrade import constants
+from panos_upgrade.cli import _read_csv_ha_pairs, _read_csv_serials, main
+from panos_upgrade.utils.file_ops import iter_json_files, read_json
+
+
+@pytest.fixture(autouse=True)
+def reset_config(monkeypatch):
+    """Drop the cached global config so each invocation uses its own work dir."""
+    monkeypatch.setattr("panos_upgrade.config._config", None)
+
+
+@pytest.fixture
+def work_dir(tmp_path):
+    """Create a work directory with inventory and upgrade paths."""
+    devices = {
+        f"00{i}": {"serial": f"00{i}", "hostname": f"fw-{i}", "current_version": "10.1.0"}
+        for i in range(1, 5)
+    }
+    devices.update({
+        f"1{i:02d}": {"serial": f"1{i:02d}", "hostname": f"fw-1{i:02d}", "current_version": "10.1.0"}
+        for i in range(12)
+    })
+    devices["009"] = {"serial": "009", "hostname": "fw-9", "current_version": "9.0.0"}
+
+    inventory_file = tmp_path / "devices" / "inventory.json"
+    inventory_file.parent.mkdir(parents=True)
+    inventory_file.write_text(json.dumps({"devices": devices}))
+
+    paths_file = tmp_path / constants.CONFIG_SUBDIR / constants.UPGRADE_PATHS_FILE_NAME
+    paths_file.parent.mkdir(parents=True)
+    paths_file.write_text(json.dumps({"10.1.0": ["10.2.0", "11.0.0"]}))
+
+    return tmp_path
+
+
+def pending_jobs(work_dir):
+    """Return the job files currently in the pending queue."""
+    return [read_json(p) for p in iter_json_files(work_dir / constants.DIR_QUEUE_PENDING)]
+
+
+class TestReadCsv:
+    """Test CSV input parsing."""
+
+    def test_serial_column_found_by_header(self, tmp_path):
+        """The serial column may be anywhere; short and blank rows are skipped."""
+        csv_file = tmp_path / "devices.csv"
+        csv_file.write_text("hostname,serial\nfw-1, 001 \nfw-2\n\nfw-3,\nfw-4,004\n")
+
+        assert _read_csv_serials(str(csv_file)) == ["001", "004"]
+
+    def test_missing_serial_column(self, tmp_path):
+        """A CSV without a serial column should be rejected."""
+        csv_file = tmp_path / "devices.csv"
+        csv_file.write_text("hostname\nfw-1\n")
+
+        with pytest.raises(click.ClickException):
+            _read_csv_serials(str(csv_file))
+
+    def test_ha_pairs_columns_found_by_header(self, tmp_path):
+        """HA pair columns are located by name and incomplete rows skipped."""
+        csv_file = tmp_path / "pairs.csv"
+        csv_file.write_text("serial_2,name,serial_1\n002,dc1,001\n004,dc2\n,dc3,005\n")
+
+        assert _read_csv_ha_pairs(str(csv_file)) == [("001", "002")]
+
+    def test_empty_ha_pairs_file(self, tmp_path):
+        """An empty HA pairs CSV should be rejected."""
+        csv_file = tmp_path / "pairs.csv"
+        csv_file.write_text("")
+
+        with pytest.raises(click.ClickException):
+            _read_csv_ha_pairs(str(csv_file))
+
+
+class TestDownloadCsv:
+    """Test the download command."""
+
+    def test_queues_eligible_devices_once(self, work_dir):
+        """Eligible serials are queued once; others are skipped with a reason."""
+        csv_file = work_dir / "devices.csv"
+        csv_file.write_text("serial\n001\n002\n002\n009\n777\n")
+
+        result = CliRunner().invoke(main, ["--work-dir", str(work_dir), "download", str(csv_file)])
+
+        assert result.exit_code == 0, result.output
+        jobs = pending_jobs(work_dir)
+        assert sorted(job["devices"][0] for job in jobs) == ["001", "002"]
+        assert all(job["type"] == constants.JOB_TYPE_DOWNLOAD_ONLY for job in jobs)
+        assert len({job["created_at"] for job in jobs}) == 1
+        assert "1 duplicate serial(s) ignored" in result.output
+        assert "Queued: 2 devices" in result.output
+        assert "Skipped (no upgrade path): 1 devices" in result.output
+        assert "Skipped (not in inventory): 1 devices" in result.output
+
+    def test_dry_run_writes_nothing(self, work_dir):
+        """Dry runs should report without creating job files."""
+        csv_file = work_dir / "devices.csv"
+        csv_file.write_text("serial\n001\n002\n")
+
+        result = CliRunner().invoke(
+            main, ["--work-dir", str(work_dir), "download", str(csv_file), "--dry-run"]
+        )
+
+        assert result.exit_code == 0, result.output
+        assert pending_jobs(work_dir) == []
+        assert "Queued: 2 devices" in result.output
+
+    def test_queued_preview_is_truncated(self, work_dir):
+        """Only the first ten queued devices should be listed."""
+        csv_file = work_dir / "devices.csv"
+        csv_file.write_text("serial\n" + "".join(f"1{i:02d}\n" for i in range(12)))
+
+        result = CliRunner().invoke(
+            main, ["--work-dir", str(work_dir), "download", str(csv_file), "--dry-run"]
+        )
+
+        assert result.exit_code == 0, result.output
+        assert "109 (fw-109)" in result.output
+        assert "110 (fw-110)" not in result.output
+        assert "... and 2 more" in result.output
+        assert "Queued: 12 devices" in result.output
+
+    def test_conflicting_job_type_is_skipped(self, work_dir):
+        """A device with an upgrade job should be skipped for download-only."""
+        runner = CliRunner()
+        runner.invoke(main, ["--work-dir", str(work_dir), "job", "submit", "--device", "001"])
+        csv_file = work_dir / "devices.csv"
+        csv_file.write_text("serial\n001\n002\n")
+
+        result = runner.invoke(main, ["--work-dir", str(work_dir), "download", str(csv_file)])
+
+        assert result.exit_code == 0, result.output
+        assert "Skipped (existing job): 1 devices" in result.output
+        assert "Queued: 1 devices" in result.output
+
+
+class TestUpgradeHaPairsCsv:
+    """Test the upgrade-ha-pairs command."""
+
+    def test_skips_pairs_with_existing_jobs(self, work_dir):
+        """A pair overlapping an earlier pair in the same CSV should be skipped."""
+        csv_file = work_dir / "pairs.csv"
+        csv_file.write_text("serial_1,serial_2\n001,002\n002,003\n003,004\n")
+
+        result = CliRunner().invoke(
+            main, ["--work-dir", str(work_dir), "upgrade-ha-pairs", str(csv_file)]
+        )
+
+        assert result.exit_code == 0, result.output
+        assert sorted(job["devices"] for job in pending_jobs(work_dir)) == [
+            ["001", "002"], ["003", "004"]
+        ]
+
+    def test_repeated_pairs_are_ignored(self, work_dir):
+        """A pair listed twice, in either order, should be processed once."""
+        csv_file = work_dir / "pairs.csv"
+        csv_file.write_text("serial_1,serial_2\n001,002\n002,001\n001,002\n")
+
+        result = CliRunner().invoke(
+            main, ["--work-dir", str(work_dir), "upgrade-ha-pairs", str(csv_file), "--dry-run"]
+        )
+
+        assert result.exit_code == 0, result.output
+        assert "2 duplicate HA pair(s) ignored" in result.output
+        assert "Total: 1 pairs processed" in result.output
+
+
+class TestJobSubmit:
+    """Test conflict handling in job submit."""
+
+    def test_ha_pair_conflicting_type_names_existing_job(self, work_dir):
+        """An HA pair overlapping a download-only job should point at that job."""
+        runner = CliRunner()
+        runner.invoke(main, ["--work-dir", str(work_dir), "job", "submit",
+                             "--device", "002", "--download-only"])
+        existing = pending_jobs(work_dir)[0]["job_id"]
+
+        result = runner.invoke(main, ["--work-dir", str(work_dir), "job", "submit",
+                                      "--ha-pair", "001", "002"])
+
+        assert result.exit_code == 1
+        assert f"panos-upgrade job cancel {existing}" in result.output
@@ -0,0 +1,67 @@
+"""Tests for CLI start-up side effects."""
+
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+from click.testing import CliRunner
+
+import panos_upgrade
+from panos_upgrade.cli import main
+
+
+class TestHelpAndVersionSkipConfig:
+    """Help, version and completion must not load config or create directories."""
+
+    @pytest.fixture
+    def runner(self):
+        """Create CLI test runner."""
+        return CliRunner()
+
+    @pytest.mark.parametrize("args", [
+        ["--help"],
+        ["--version"],
+        ["job", "--help"],
+        ["job", "submit", "--help"],
+        ["device", "discover", "--help"],
+    ])
+    def test_no_work_dir_created(self, runner, tmp_path, args):
+        """Work directory should not be created for informational commands."""
+        work_dir = tmp_path / "work"
+
+        result = runner.invoke(main, ["--work-dir", str(work_dir)] + args)
+
+        assert result.exit_code == 0
+        assert not work_dir.exists()
+
+    def test_shell_completion_skips_config(self, runner, tmp_path, monkeypatch):
+        """Tab completion should list commands without touching the work directory."""
+        work_dir = tmp_path / "work"
+        monkeypatch.setenv("COMP_WORDS", f"panos-upgrade --work-dir {work_dir} jo")
+        monkeypatch.setenv("COMP_CWORD", "3")
+
+        result = runner.invoke(
+            main, [], prog_name="panos-upgrade",
+            env={"_PANOS_UPGRADE_COMPLETE": "bash_complete"}
+        )
+
+        assert "job" in result.output
+        assert not work_dir.exists()
+
+    def test_import_skips_package_modules(self):
+        """Importing the CLI should not load config or work dir resolution."""
+        code = (
+            "import sys, panos_upgrade.cli; "
+            "print(sorted(m for m in sys.modules if m.startswith('panos_upgrade.')))"
+        )
+
+        src_dir = Path(panos_upgrade.__file__).parent.parent
+        env = dict(os.environ, PYTHONPATH=str(src_dir))
+
+        result = subprocess.run(
+            [sys.executable, "-c", code], capture_output=True, text=True, check=True, env=env
+        )
+
+        assert result.stdout.strip() == "['panos_upgrade.cli']"
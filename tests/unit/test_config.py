@@ -0,0 +1,146 @@
+"""Tests for configuration loading."""
+
+import shutil
+
+from panos_upgrade import constants
+from panos_upgrade.config import Config
+
+
+class TestEnsureDirectories:
+    """Test work directory creation."""
+
+    def test_creates_structure_and_marker(self, tmp_path):
+        """First load should create all directories and the marker file."""
+        Config(work_dir=tmp_path)
+
+        assert (tmp_path / constants.DIR_QUEUE_PENDING).is_dir()
+        assert (tmp_path / constants.DIR_COMMANDS_PROCESSED).is_dir()
+        assert (tmp_path / constants.INITIALIZED_MARKER_FILE).is_file()
+
+    def test_marker_skips_mkdir(self, tmp_path, monkeypatch):
+        """Later loads should not call mkdir when the marker matches."""
+        Config(work_dir=tmp_path)
+        calls = []
+        monkeypatch.setattr(
+            "panos_upgrade.config.ensure_directory_structure",
+            lambda *args: calls.append(args)
+        )
+
+        Config(work_dir=tmp_path)
+
+        assert calls == []
+
+    def test_stale_marker_recreates_directories(self, tmp_path):
+        """A marker from a different directory layout should not be trusted."""
+        Config(work_dir=tmp_path)
+        shutil.rmtree(tmp_path / constants.DIR_COMMANDS)
+        (tmp_path / constants.INITIALIZED_MARKER_FILE).write_text("config\n")
+
+        Config(work_dir=tmp_path)
+
+        assert (tmp_path / constants.DIR_COMMANDS_INCOMING).is_dir()
+
+    def test_deleted_directory_is_recreated(self, tmp_path):
+        """A matching marker should not hide a directory removed since."""
+        Config(work_dir=tmp_path)
+        shutil.rmtree(tmp_path / constants.DIR_COMMANDS_INCOMING)
+
+        Config(work_dir=tmp_path)
+
+        assert (tmp_path / constants.DIR_COMMANDS_INCOMING).is_dir()
+
+
+class TestGet:
+    """Test dot-notation lookups."""
+
+    def test_missing_key_returns_each_callers_default(self, tmp_path):
+        """A cached miss should still honour the default passed on each call."""
+        config = Config(work_dir=tmp_path)
+
+        assert config.get("panorama.missing", "a") == "a"
+        assert config.get("panorama.missing", "b") == "b"
+
+    def test_set_invalidates_cached_values(self, tmp_path):
+        """Values read before set() should not be returned afterwards."""
+        config = Config(work_dir=tmp_path)
+        assert config.max_workers == constants.DEFAULT_WORKERS
+
+        config.set("workers.max", 3)
+        config.set("panorama.extra.value", "x")
+
+        assert config.max_workers == 3
+        assert config.get("panorama.extra.value") == "x"
+
+    def test_unchanged_value_is_not_saved(self, tmp_path, monkeypatch):
+        """Setting a key to its current value should not rewrite the file."""
+        config = Config(work_dir=tmp_path)
+        config.save()
+        saves = []
+        monkeypatch.setattr(config, "save", lambda: saves.append(1))
+
+        config.set("workers.max", constants.DEFAULT_WORKERS)
+
+        assert saves == []
+
+    def test_type_change_is_saved(self, tmp_path):
+        """A value that compares equal but has another type should be written."""
+        config = Config(work_dir=tmp_path)
+        config.set("workers.max", 1)
+
+        config.set("workers.max", True)
+
+        assert Config(work_dir=tmp_path).get("workers.max") is True
+
+    def test_unchanged_value_creates_missing_file(self, tmp_path):
+        """Setting a default value should still create a missing config file."""
+        config = Config(work_dir=tmp_path)
+
+        config.set("workers.max", constants.DEFAULT_WORKERS)
+
+        assert config.config_file.is_file()
+
+    def test_unchanged_value_flushes_pending_changes(self, tmp_path):
+        """A saving set() should write earlier save=False changes even if it changes nothing."""
+        config = Config(work_dir=tmp_path)
+        config.save()
+        config.set("workers.max", 7, save=False)
+
+        config.set("panorama.rate_limit", constants.DEFAULT_RATE_LIMIT)
+
+        assert Config(work_dir=tmp_path).max_workers == 7
+
+    def test_batched_sets_save_once_on_flush(self, tmp_path):
+        """Changes made with save=False should be written by flush()."""
+        config = Config(work_dir=tmp_path)
+
+        config.set("workers.max", 7, save=False)
+        config.set("panorama.rate_limit", 30, save=False)
+        assert not config.config_file.exists()
+
+        config.flush()
+
+        reloaded = Config(work_dir=tmp_path)
+        assert reloaded.max_workers == 7
+        assert reloaded.rate_limit == 30
+
+    def test_key_below_scalar_value_returns_default(self, tmp_path):
+        """Walking past a non-dict value should return the default."""
+        config = Config(work_dir=tmp_path)
+
+        assert config.get("panorama.host.name", "none") == "none"
+        assert config.get("validation.custom_metrics.x", "none") == "none"
+
+
+class TestLoadConfig:
+    """Test reading the config file."""
+
+    def test_defaults_only_built_without_config_file(self, tmp_path, monkeypatch):
+        """An existing config file should be used without building defaults."""
+        Config(work_dir=tmp_path).save()
+
+        def fail(self):
+            raise AssertionError("defaults built")
+
+        monkeypatch.setattr(Config, "_get_default_config", fail)
+
+        assert Config(work_dir=tmp_path).max_workers == constants.DEFAULT_WORKERS
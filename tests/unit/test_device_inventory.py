@@ -167,6 +167,66 @@ class TestDeviceInventoryExport:
         assert device_1['ha_state'] == HA_STATE_ACTIVE
         assert device_2['ha_state'] == HA_STATE_PASSIVE
 
+    
+    def test_export_command_writes_csv_files(self, inventory_with_mixed_devices, tmp_path, monkeypatch):
+        """The export command should write both CSV files with the expected rows."""
+        import csv
+        from click.testing import CliRunner
+        from panos_upgrade.cli import main
+        
+        monkeypatch.setattr("panos_upgrade.config._config", None)
+        work_dir = tmp_path / "work"
+        (work_dir / "devices").mkdir(parents=True)
+        inventory_with_mixed_devices.rename(work_dir / "devices" / "inventory.json")
+        out_dir = tmp_path / "out"
+        
+        result = CliRunner().invoke(
+            main, ["--work-dir", str(work_dir), "device", "export", "--output-dir", str(out_dir)]
+        )
+        
+        assert result.exit_code == 0, result.output
+        with open(out_dir / "standalone_devices.csv", newline='') as f:
+            standalone_rows = list(csv.reader(f))
+        with open(out_dir / "ha_pairs.csv", newline='') as f:
+            ha_rows = list(csv.reader(f))
+        
+        assert standalone_rows[0] == ['serial', 'hostname', 'mgmt_ip', 'current_version', 'model']
+        assert sorted(row[0] for row in standalone_rows[1:]) == ["001234567892", "001234567893"]
+        assert ha_rows[1][:2] == ["001234567890", "001234567891"]
+
+    def test_export_pairs_active_first_and_keeps_orphans(self, tmp_path, monkeypatch):
+        """Pairs should list the active member first regardless of inventory order."""
+        import csv
+        from click.testing import CliRunner
+        from panos_upgrade.cli import main
+        
+        def ha_device(serial, peer, state):
+            return {"serial": serial, "hostname": f"fw-{serial}", "device_type": DEVICE_TYPE_HA_PAIR,
+                    "peer_serial": peer, "ha_state": state}
+        
+        monkeypatch.setattr("panos_upgrade.config._config", None)
+        work_dir = tmp_path / "work"
+        (work_dir / "devices").mkdir(parents=True)
+        (work_dir / "devices" / "inventory.json").write_text(json.dumps({"devices": {
+            "002": ha_device("002", "001", HA_STATE_PASSIVE),
+            "009": ha_device("009", "999", HA_STATE_ACTIVE),
+            "001": ha_device("001", "002", HA_STATE_ACTIVE),
+        }}))
+        out_dir = tmp_path / "out"
+        
+        result = CliRunner().invoke(
+            main, ["--work-dir", str(work_dir), "device", "export", "--output-dir", str(out_dir)]
+        )
+        
+        assert result.exit_code == 0, result.output
+        with open(out_dir / "ha_pairs.csv", newline='') as f:
+            ha_rows = list(csv.reader(f))
+        with open(out_dir / "standalone_devices.csv", newline='') as f:
+            standalone_rows = list(csv.reader(f))
+        
+        assert [row[:2] for row in ha_rows[1:]] == [["001", "002"]]
+        assert [row[0] for row in standalone_rows[1:]] == ["009"]
+
 
 class TestHAStateDetection:
     """Test HA state detection logic."""
@@ -263,3 +323,66 @@ class TestOrphanedHADevices:
         assert len(orphaned) == 1
         assert orphaned[0]['serial'] == '001234567890'
 
+
+class TestReadOnlyInventory:
+    """Test inventory use without a Panorama client."""
+    
+    def test_lookup_without_panorama(self, tmp_path):
+        """Inventory lookups should work without a Panorama client."""
+        inventory_file = tmp_path / "inventory.json"
+        inventory_file.write_text(json.dumps({
+            "devices": {"001": {"serial": "001", "current_version": "10.1.0"}}
+        }))
+        
+        inventory = DeviceInventory(inventory_file)
+        
+        assert inventory.get_device("001")["current_version"] == "10.1.0"
+    
+    def test_discover_requires_panorama(self, tmp_path):
+        """Discovery should fail clearly when no Panorama client was given."""
+        from panos_upgrade.exceptions import ConfigurationError
+        
+        inventory = DeviceInventory(tmp_path / "inventory.json")
+        
+        with pytest.raises(ConfigurationError):
+            inventory.discover_devices()
+    
+    def test_reload_skips_unchanged_file(self, tmp_path, monkeypatch):
+        """Reload should only re-parse the inventory after it changes on disk."""
+        from panos_upgrade.utils.file_ops import atomic_write_json
+        
+        inventory_file = tmp_path / "inventory.json"
+        atomic_write_json(inventory_file, {"devices": {"001": {"serial": "001"}}})
+        inventory = DeviceInventory(inventory_file)
+        
+        calls = []
+        monkeypatch.setattr(inventory, "_load_inventory", lambda: calls.append(1))
+        inventory.reload()
+        assert calls == []
+        
+        atomic_write_json(inventory_file, {"devices": {}})
+        inventory.reload()
+        assert calls == [1]
+    
+    def test_devices_by_version_tracks_reloads(self, tmp_path):
+        """Version lookups should reflect the inventory after it is reloaded."""
+        from panos_upgrade.utils.file_ops import atomic_write_json
+        
+        inventory_file = tmp_path / "inventory.json"
+        atomic_write_json(inventory_file, {"devices": {
+            "001": {"serial": "001", "current_version": "10.1.0"},
+            "002": {"serial": "002", "current_version": "10.2.0"},
+            "003": {"serial": "003", "current_version": "10.1.0"},
+        }})
+        inventory = DeviceInventory(inventory_file)
+        
+        assert [d["serial"] for d in inventory.get_devices_by_version("10.1.0")] == ["001", "003"]
+        assert inventory.get_devices_by_version("11.0.0") == []
+        
+        atomic_write_json(inventory_file, {"devices": {
+            "001": {"serial": "001", "current_version": "10.2.0"},
+        }})
+        inventory.reload()
+        
+        assert inventory.get_devices_by_version("10.1.0") == []
+        assert [d["serial"] for d in inventory.get_devices_by_version("10.2.0")] == ["001"]
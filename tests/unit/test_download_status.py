@@ -0,0 +1,93 @@
+"""Tests for the download-status summary."""
+
+import json
+import pytest
+
+from panos_upgrade.cli import _read_upgrade_status
+
+
+class TestReadUpgradeStatus:
+    """Test extraction of upgrade_status from device status files."""
+
+    def test_reads_status_from_written_file(self, tmp_path):
+        """Should return the status from a normally formatted file."""
+        status_file = tmp_path / "001.json"
+        status_file.write_text(json.dumps({
+            "serial": "001",
+            "upgrade_message": 'saw "upgrade_status": "failed" in output',
+            "upgrade_status": "downloading",
+        }, indent=2, sort_keys=True))
+
+        assert _read_upgrade_status(status_file) == "downloading"
+
+    def test_missing_field_returns_empty_string(self, tmp_path):
+        """Files without the field should still count as tracked."""
+        status_file = tmp_path / "001.json"
+        status_file.write_text('{"serial": "001"}')
+
+        assert _read_upgrade_status(status_file) == ""
+
+    def test_empty_document_and_missing_file_return_none(self, tmp_path):
+        """Empty documents and vanished files should not be counted."""
+        status_file = tmp_path / "001.json"
+        status_file.write_text("{}")
+
+        assert _read_upgrade_status(status_file) is None
+        assert _read_upgrade_status(tmp_path / "missing.json") is None
+
+    def test_invalid_json_raises_value_error(self, tmp_path):
+        """Malformed files should raise ValueError like safe_read_json."""
+        status_file = tmp_path / "001.json"
+        status_file.write_text("{broken")
+
+        with pytest.raises(ValueError):
+            _read_upgrade_status(status_file)
+
+
+class TestDownloadStatusCommand:
+    """Test the download-status command output."""
+
+    @pytest.fixture(autouse=True)
+    def reset_config(self, monkeypatch):
+        """Drop the cached global config so the command uses this test's work dir."""
+        monkeypatch.setattr("panos_upgrade.config._config", None)
+
+    def test_counts_statuses(self, tmp_path):
+        """Summary should count each download-related status."""
+        from click.testing import CliRunner
+        from panos_upgrade import constants
+        from panos_upgrade.cli import main
+
+        devices_dir = tmp_path / constants.DIR_STATUS_DEVICES
+        devices_dir.mkdir(parents=True)
+        statuses = [
+            constants.STATUS_DOWNLOAD_COMPLETE,
+            constants.STATUS_DOWNLOAD_COMPLETE,
+            constants.STATUS_DOWNLOADING,
+            constants.STATUS_FAILED,
+            constants.STATUS_PENDING,
+        ]
+        for i, status in enumerate(statuses):
+            (devices_dir / f"{i:03d}.json").write_text(json.dumps({"upgrade_status": status}))
+
+        result = CliRunner().invoke(main, ["--work-dir", str(tmp_path), "download-status"])
+
+        assert result.exit_code == 0
+        assert "Total devices tracked: 5" in result.output
+        assert "Download complete: 2" in result.output
+        assert "Currently downloading: 1" in result.output
+        assert "Failed: 1" in result.output
+
+    def test_empty_directory_reports_no_files(self, tmp_path):
+        """An existing but empty status directory should not print zero counts."""
+        from click.testing import CliRunner
+        from panos_upgrade import constants
+        from panos_upgrade.cli import main
+
+        (tmp_path / constants.DIR_STATUS_DEVICES).mkdir(parents=True)
+
+        result = CliRunner().invoke(main, ["--work-dir", str(tmp_path), "download-status"])
+
+        assert result.exit_code == 0
+        assert "No device status files found" in result.output
+        assert "Total devices tracked" not in result.output
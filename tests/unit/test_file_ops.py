@@ -0,0 +1,220 @@
+"""Tests for atomic JSON file operations."""
+
+import json
+import pytest
+from pathlib import Path
+
+from panos_upgrade.utils.file_ops import (
+    atomic_write_json,
+    count_json_files,
+    dumps_json,
+    iter_json_files,
+    map_files,
+    read_file_bytes,
+    read_json,
+    read_json_files,
+    safe_read_json,
+    write_json_files,
+)
+
+
+class TestIterJsonFiles:
+    """Test scandir-based JSON file iteration."""
+
+    def test_yields_only_visible_json_files(self, tmp_path):
+        """Should skip hidden temp files, other suffixes and directories."""
+        (tmp_path / "job-1.json").write_text("{}")
+        (tmp_path / "job-2.json").write_text("{}")
+        (tmp_path / ".job-3.json.abc.tmp").write_text("{}")
+        (tmp_path / ".hidden.json").write_text("{}")
+        (tmp_path / "notes.txt").write_text("")
+        (tmp_path / "subdir.json").mkdir()
+
+        names = sorted(Path(p).name for p in iter_json_files(tmp_path))
+
+        assert names == ["job-1.json", "job-2.json"]
+
+    def test_missing_directory_yields_nothing(self, tmp_path):
+        """Should treat a missing directory as empty."""
+        assert list(iter_json_files(tmp_path / "missing")) == []
+
+
+class TestJsonRoundTrip:
+    """Test JSON serialization helpers and atomic writes."""
+
+    def test_atomic_write_then_read(self, tmp_path):
+        """Data written atomically should read back unchanged."""
+        job_file = tmp_path / "queue" / "job.json"
+        data = {"job_id": "cli-1", "devices": ["001234567890"], "dry_run": False}
+
+        atomic_write_json(job_file, data)
+
+        assert read_json(job_file) == data
+        assert [p.name for p in job_file.parent.iterdir()] == ["job.json"]
+
+    def test_dumps_is_indented_and_sorted(self):
+        """Output format should match json.dumps(indent=2, sort_keys=True)."""
+        data = {"b": 1, "a": {"d": [1, 2], "c": "x"}}
+
+        assert dumps_json(data) == json.dumps(data, indent=2, sort_keys=True).encode()
+
+    def test_safe_read_invalid_json_raises_value_error(self, tmp_path):
+        """Invalid JSON should surface as ValueError regardless of backend."""
+        bad_file = tmp_path / "bad.json"
+        bad_file.write_text("{not json")
+
+        with pytest.raises(ValueError):
+            safe_read_json(bad_file)
+
+    def test_safe_read_missing_returns_default(self, tmp_path):
+        """Missing files should return the supplied default."""
+        assert safe_read_json(tmp_path / "missing.json", {"a": 1}) == {"a": 1}
+
+
+class TestReadJsonFiles:
+    """Test bulk JSON reads."""
+
+    @pytest.mark.parametrize("count", [3, 20])
+    def test_results_follow_input_order(self, tmp_path, count):
+        """Serial and thread-pool paths should both preserve input order."""
+        paths = []
+        for i in range(count):
+            path = tmp_path / f"job-{i}.json"
+            path.write_text(json.dumps({"index": i}))
+            paths.append(path)
+
+        results = list(read_json_files(paths))
+
+        assert [r["index"] for r in results] == list(range(count))
+
+    def test_unreadable_files_yield_none(self, tmp_path):
+        """Missing and malformed files should yield None instead of raising."""
+        good = tmp_path / "good.json"
+        good.write_text('{"ok": true}')
+        bad = tmp_path / "bad.json"
+        bad.write_text("{broken")
+
+        results = list(read_json_files([good, bad, tmp_path / "missing.json"]))
+
+        assert results == [{"ok": True}, None, None]
+
+    def test_must_contain_skips_other_files(self, tmp_path):
+        """Files without any of the needles should yield None."""
+        hit = tmp_path / "hit.json"
+        hit.write_text('{"devices": ["001"]}')
+        miss = tmp_path / "miss.json"
+        miss.write_text('{"devices": ["002"]}')
+
+        results = list(read_json_files([hit, miss], must_contain=[b"001"]))
+
+        assert results == [{"devices": ["001"]}, None]
+
+
+class TestWriteJsonFiles:
+    """Test bulk atomic JSON writes."""
+
+    @pytest.mark.parametrize("count", [3, 20])
+    def test_writes_all_files(self, tmp_path, count):
+        """Serial and thread-pool paths should write every file."""
+        items = [(tmp_path / f"job-{i}.json", {"index": i}) for i in range(count)]
+
+        errors = write_json_files(items)
+
+        assert errors == [None] * count
+        assert [read_json(path)["index"] for path, _ in items] == list(range(count))
+
+    def test_failures_are_reported_per_item(self, tmp_path):
+        """A failed write should be returned without stopping the others."""
+        blocker = tmp_path / "blocker"
+        blocker.write_text("")
+        items = [(tmp_path / "ok.json", {"ok": True}), (blocker / "bad.json", {})]
+
+        errors = write_json_files(items)
+
+        assert errors[0] is None
+        assert isinstance(errors[1], OSError)
+        assert read_json(tmp_path / "ok.json") == {"ok": True}
+        assert sorted(p.name for p in tmp_path.iterdir()) == ["blocker", "ok.json"]
+
+    def test_no_temp_files_left_behind(self, tmp_path):
+        """Only the final files should remain after a batch."""
+        items = [(tmp_path / f"job-{i}.json", {"index": i}) for i in range(10)]
+
+        write_json_files(items)
+
+        assert sorted(p.name for p in tmp_path.iterdir()) == sorted(p.name for p, _ in items)
+
+
+class TestReadFileBytes:
+    """Test raw whole-file reads."""
+
+    @pytest.mark.parametrize("size", [0, 100, 65536, 200_000])
+    def test_reads_whole_file(self, tmp_path, size):
+        """Files smaller and larger than one read chunk should be read fully."""
+        path = tmp_path / "data.bin"
+        data = bytes(i % 251 for i in range(size))
+        path.write_bytes(data)
+
+        assert read_file_bytes(path) == data
+
+    def test_missing_file_raises(self, tmp_path):
+        """Missing files should raise FileNotFoundError."""
+        with pytest.raises(FileNotFoundError):
+            read_file_bytes(tmp_path / "missing.json")
+
+
+class TestMapFiles:
+    """Test threaded per-file mapping."""
+
+    @pytest.mark.parametrize("count", [3, 20])
+    def test_results_follow_input_order(self, tmp_path, count):
+        """Serial and thread-pool paths should both preserve input order."""
+        paths = [tmp_path / f"{i}.txt" for i in range(count)]
+        for i, path in enumerate(paths):
+            path.write_text(str(i))
+
+        assert list(map_files(read_file_bytes, paths)) == [str(i).encode() for i in range(count)]
+
+    def test_exceptions_propagate(self, tmp_path):
+        """Errors from the mapped function should reach the caller."""
+        paths = [tmp_path / f"missing-{i}.txt" for i in range(20)]
+
+        with pytest.raises(FileNotFoundError):
+            list(map_files(read_file_bytes, paths))
+
+
+class TestCountJsonFiles:
+    """Test cached JSON file counting."""
+
+    def test_counts_like_iter_json_files(self, tmp_path):
+        """Hidden temp files and other suffixes should not be counted."""
+        (tmp_path / "job-1.json").write_text("{}")
+        (tmp_path / ".job-2.json.tmp").write_text("{}")
+        (tmp_path / "notes.txt").write_text("")
+
+        assert count_json_files(tmp_path) == 1
+        assert count_json_files(tmp_path / "missing") == 0
+
+    def test_unchanged_directory_uses_cache(self, tmp_path, monkeypatch):
+        """A settled directory with an unchanged mtime should not be rescanned."""
+        import os
+        (tmp_path / "job-1.json").write_text("{}")
+        os.utime(tmp_path, ns=(0, 1_000_000_000))
+        cache = {}
+
+        assert count_json_files(tmp_path, cache) == 1
+        monkeypatch.setattr("panos_upgrade.utils.file_ops.iter_json_files", lambda d: iter(()))
+        assert count_json_files(tmp_path, cache) == 1
+
+        # A new entry changes the mtime, so the (stubbed) scan runs again
+        (tmp_path / "job-2.json").write_text("{}")
+        assert count_json_files(tmp_path, cache) == 0
+
+    def test_recently_changed_directory_is_not_cached(self, tmp_path):
+        """A directory modified within the last second should be rescanned."""
+        (tmp_path / "job-1.json").write_text("{}")
+        cache = {}
+
+        count_json_files(tmp_path, cache)
+
+        assert cache == {}
@@ -0,0 +1,194 @@
+"""Tests for CLI job queue helpers."""
+
+import json
+import pytest
+
+from panos_upgrade import constants
+from panos_upgrade.cli import (
+    _add_to_job_index,
+    _build_job_index,
+    _check_for_existing_job,
+    _check_for_existing_jobs,
+    _new_job_id,
+    _utc_timestamp,
+)
+from panos_upgrade.config import Config
+from panos_upgrade.exceptions import (
+    ActiveJobError,
+    ConflictingJobTypeError,
+    PendingJobError,
+)
+
+
+@pytest.fixture
+def config(tmp_path):
+    """Create a configuration rooted in a temporary work directory."""
+    return Config(work_dir=tmp_path)
+
+
+def write_job(config, queue_dir, job_id, job_type, devices):
+    """Write a job file into one of the queue directories."""
+    job_file = config.get_path(queue_dir) / f"{job_id}.json"
+    job_file.write_text(json.dumps({
+        "job_id": job_id,
+        "type": job_type,
+        "devices": devices,
+        "created_at": "2025-01-01T00:00:00+00:00Z"
+    }))
+
+
+class TestNewJobId:
+    """Test job ID generation."""
+
+    def test_ids_are_unique_and_prefixed(self):
+        """Every generated ID should be unique and carry the prefix."""
+        ids = {_new_job_id("cli") for _ in range(1000)}
+
+        assert len(ids) == 1000
+        assert all(job_id.startswith("cli-") for job_id in ids)
+
+    def test_ids_sort_in_creation_order(self, monkeypatch):
+        """IDs created later should sort after earlier ones."""
+        clock = iter([1_000_000_000, 2_000_000_000])
+        monkeypatch.setattr("panos_upgrade.cli.time.time_ns", lambda: next(clock))
+
+        first = _new_job_id("cli")
+        second = _new_job_id("cli")
+
+        assert sorted([second, first]) == [first, second]
+
+    def test_ids_within_one_millisecond_keep_order(self, monkeypatch):
+        """A burst of IDs in the same millisecond should still sort in order."""
+        monkeypatch.setattr("panos_upgrade.cli.time.time_ns", lambda: 5_000_000_000)
+
+        ids = [_new_job_id("csv-ha") for _ in range(50)]
+
+        assert sorted(ids) == ids
+        assert len(set(ids)) == 50
+
+
+class TestCheckForExistingJob:
+    """Test detection of pending and active jobs for a device."""
+
+    def test_no_jobs(self, config):
+        """Devices without queued jobs should pass."""
+        _check_for_existing_job(config, "001", constants.JOB_TYPE_STANDALONE)
+
+    def test_pending_job(self, config):
+        """A pending job of the same type should raise PendingJobError."""
+        write_job(config, constants.DIR_QUEUE_PENDING, "job-1",
+                  constants.JOB_TYPE_STANDALONE, ["001"])
+
+        with pytest.raises(PendingJobError) as exc_info:
+            _check_for_existing_job(config, "001", constants.JOB_TYPE_STANDALONE)
+
+        assert exc_info.value.job_id == "job-1"
+
+    def test_active_job(self, config):
+        """An active job of the same type should raise ActiveJobError."""
+        write_job(config, constants.DIR_QUEUE_ACTIVE, "job-2",
+                  constants.JOB_TYPE_HA_PAIR, ["001", "002"])
+
+        with pytest.raises(ActiveJobError):
+            _check_for_existing_job(config, "002", constants.JOB_TYPE_HA_PAIR)
+
+    def test_conflicting_job_type(self, config):
+        """A job of a different type should raise ConflictingJobTypeError."""
+        write_job(config, constants.DIR_QUEUE_PENDING, "job-3",
+                  constants.JOB_TYPE_DOWNLOAD_ONLY, ["001"])
+
+        with pytest.raises(ConflictingJobTypeError) as exc_info:
+            _check_for_existing_job(config, "001", constants.JOB_TYPE_STANDALONE)
+
+        assert exc_info.value.existing_job_id == "job-3"
+
+    def test_malformed_job_files_are_skipped(self, config):
+        """Invalid job files should not block submissions."""
+        bad_file = config.get_path(constants.DIR_QUEUE_PENDING) / "bad.json"
+        bad_file.write_text("{not json")
+
+        _check_for_existing_job(config, "001", constants.JOB_TYPE_STANDALONE)
+
+    def test_ha_pair_reports_matching_serial(self, config):
+        """A multi-serial check should report the serial found in the queue."""
+        write_job(config, constants.DIR_QUEUE_PENDING, "job-4",
+                  constants.JOB_TYPE_HA_PAIR, ["002", "003"])
+
+        with pytest.raises(PendingJobError) as exc_info:
+            _check_for_existing_jobs(config, ["001", "002"], constants.JOB_TYPE_HA_PAIR)
+
+        assert exc_info.value.device_serial == "002"
+
+    def test_pending_reported_before_active(self, config):
+        """A device queued in both directories should report the pending job."""
+        write_job(config, constants.DIR_QUEUE_ACTIVE, "job-5",
+                  constants.JOB_TYPE_STANDALONE, ["001"])
+        write_job(config, constants.DIR_QUEUE_PENDING, "job-6",
+                  constants.JOB_TYPE_STANDALONE, ["001"])
+
+        with pytest.raises(PendingJobError) as exc_info:
+            _check_for_existing_job(config, "001", constants.JOB_TYPE_STANDALONE)
+
+        assert exc_info.value.job_id == "job-6"
+
+
+class TestJobIndex:
+    """Test the serial -> job index used by bulk submissions."""
+
+    def test_index_maps_every_device(self, config):
+        """Each serial in a queued job should map to that job and its queue."""
+        write_job(config, constants.DIR_QUEUE_PENDING, "job-1",
+                  constants.JOB_TYPE_HA_PAIR, ["001", "002"])
+        write_job(config, constants.DIR_QUEUE_ACTIVE, "job-2",
+                  constants.JOB_TYPE_STANDALONE, ["003"])
+
+        job_index = _build_job_index(config)
+
+        assert {serial: (status, job["job_id"]) for serial, (status, job) in job_index.items()} == {
+            "001": ("pending", "job-1"),
+            "002": ("pending", "job-1"),
+            "003": ("active", "job-2"),
+        }
+
+    def test_index_for_serials_skips_unrelated_jobs(self, config):
+        """An index built for given serials should only parse files naming them."""
+        write_job(config, constants.DIR_QUEUE_PENDING, "job-1",
+                  constants.JOB_TYPE_HA_PAIR, ["001", "002"])
+        write_job(config, constants.DIR_QUEUE_PENDING, "job-2",
+                  constants.JOB_TYPE_STANDALONE, ["003"])
+
+        job_index = _build_job_index(config, ["002"])
+
+        assert set(job_index) == {"001", "002"}
+
+    def test_check_uses_index_without_rescanning(self, config):
+        """Jobs added to the index should be detected without touching disk."""
+        job_index = _build_job_index(config)
+        _add_to_job_index(job_index, "pending", {
+            "job_id": "job-3", "type": constants.JOB_TYPE_STANDALONE, "devices": ["001"]
+        })
+
+        with pytest.raises(PendingJobError):
+            _check_for_existing_job(config, "001", constants.JOB_TYPE_STANDALONE, job_index)
+
+    def test_malformed_devices_are_ignored(self, config):
+        """Jobs with an unusable devices field should not break indexing."""
+        job_index = {}
+        _add_to_job_index(job_index, "pending", None)
+        _add_to_job_index(job_index, "pending", {"devices": None})
+
+        assert job_index == {}
+
+
+class TestUtcTimestamp:
+    """Test job timestamp formatting."""
+
+    def test_matches_datetime_format(self, monkeypatch):
+        """Output should match datetime.isoformat() + 'Z' for the same instant."""
+        from datetime import datetime, timezone
+
+        ns = 1_736_000_000_123_456_789
+        monkeypatch.setattr("panos_upgrade.cli.time.time_ns", lambda: ns)
+        expected = datetime.fromtimestamp(ns // 1000 / 1_000_000, timezone.utc)
+
+        assert _utc_timestamp() == expected.isoformat() + "Z"
@@ -0,0 +1,62 @@
+"""Tests for the daemon's API rate limiter."""
+
+import pytest
+
+from panos_upgrade.daemon import RateLimiter
+from panos_upgrade.exceptions import ConfigurationError
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Replace the limiter's clock and sleep with a fake that records sleeps."""
+    state = {"now": 1000.0, "sleeps": [], "advance": True}
+
+    def sleep(seconds):
+        state["sleeps"].append(seconds)
+        if state["advance"]:
+            state["now"] += seconds
+
+    monkeypatch.setattr("panos_upgrade.daemon.time.monotonic", lambda: state["now"])
+    monkeypatch.setattr("panos_upgrade.daemon.time.sleep", sleep)
+    return state
+
+
+class TestRateLimiter:
+    """Test token bucket behaviour."""
+
+    def test_burst_up_to_limit_without_waiting(self, clock):
+        """A full bucket should hand out one minute's worth of tokens at once."""
+        limiter = RateLimiter(60)
+
+        assert all(limiter.acquire() for _ in range(60))
+        assert clock["sleeps"] == []
+        assert limiter.acquire(blocking=False) is False
+
+    def test_blocking_waits_exactly_for_next_token(self, clock):
+        """An empty bucket should sleep once for the time until a token accrues."""
+        limiter = RateLimiter(60)
+        for _ in range(60):
+            limiter.acquire()
+
+        assert limiter.acquire() is True
+        assert clock["sleeps"] == [pytest.approx(1.0)]
+
+    def test_queued_waiters_reserve_successive_tokens(self, clock):
+        """Each waiter should be scheduled one token interval after the previous one."""
+        limiter = RateLimiter(60)
+        for _ in range(60):
+            limiter.acquire()
+
+        # Sleeps don't advance the clock, as for callers arriving together
+        clock["advance"] = False
+        limiter.acquire()
+        limiter.acquire()
+
+        assert clock["sleeps"] == [pytest.approx(1.0), pytest.approx(2.0)]
+        assert limiter.acquire(blocking=False) is False
+
+    @pytest.mark.parametrize("rate", [0, -5])
+    def test_non_positive_rate_is_rejected(self, rate):
+        """A zero or negative rate should fail clearly instead of dividing by zero."""
+        with pytest.raises(ConfigurationError):
+            RateLimiter(rate)